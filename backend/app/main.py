@@ -224,6 +224,13 @@ async def on_startup():
             logger.error(f"Failed to create browser-opening task: {e}", exc_info=True)
             # Still don't crash - just continue running the server
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Shutdown event handler / 关闭事件处理"""
+    from app.services.crawler_service import crawler_service
+
+    await crawler_service.aclose()
+
 # --- Static Files / SPA Support (Added for Packaging) ---
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -47,6 +47,13 @@ import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+# orjson 为可选依赖，缺失时回退到标准库 / orjson is optional; fall back to stdlib json
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
 
 @dataclass(frozen=True)
 class PromptPair:
@@ -63,6 +70,19 @@ P1_MARKER = "【P1-应当】"  # SHOULD - 强烈建议
 P2_MARKER = "【P2-建议】"  # MAY - 可选建议
 
 
+# =============================================================================
+# Compact JSON (紧凑 JSON 序列化)
+# =============================================================================
+def _dumps_compact(payload: Any) -> str:
+    """
+    Serialize payload as compact, non-ASCII-escaped JSON.
+    将 payload 序列化为紧凑 JSON（保留中文原文，不转义）。
+    """
+    if _orjson_available:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
 # =============================================================================
 # Smart Truncation (智能截断)
 # =============================================================================
@@ -3480,7 +3500,7 @@ def text_chunk_rerank_prompt(query: str, payload: List[Dict[str, str]]) -> Promp
             "### 候选片段（每项含 id, text）",
             "",
             "<<<CANDIDATES_START>>>",
-            json.dumps(payload, ensure_ascii=False),
+            _dumps_compact(payload),
             "<<<CANDIDATES_END>>>",
             "",
             "### 输出示例（学习格式，不要照抄）",
@@ -12,6 +12,7 @@ License: PolyForm Noncommercial License 1.0.0
   Provides CRUD operations for character cards, world cards, and style cards.
 """
 
+from pathlib import Path
 from typing import List, Optional
 
 import asyncio
@@ -51,8 +52,6 @@ async def _resolve_project_language(project_id: str, request_language: Optional[
         return explicit
 
     try:
-        from pathlib import Path
-
         project_yaml = Path(card_storage.data_dir) / project_id / "project.yaml"
         if not project_yaml.exists():
             return "zh"
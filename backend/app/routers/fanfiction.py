@@ -146,7 +146,7 @@ async def preview_page(request: PreviewRequest):
     try:
         if not _is_http_url(request.url):
             return PreviewResponse(success=False, error="仅支持 http/https 链接。")
-        result = crawler_service.scrape_page(request.url)
+        result = await crawler_service.scrape_page_async(request.url)
         
         if not result['success']:
             return PreviewResponse(
@@ -179,7 +179,7 @@ async def extract_cards(request: ExtractRequest):
         if url:
             if not _is_http_url(url):
                 return {"success": False, "error": "仅支持 http/https 链接。", "proposals": []}
-            crawl_result = crawler_service.scrape_page(url)
+            crawl_result = await crawler_service.scrape_page_async(url)
             if not crawl_result.get("success"):
                 return {"success": False, "error": crawl_result.get("error", "Crawl failed"), "proposals": []}
             title = crawl_result.get("title") or title
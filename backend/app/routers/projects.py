@@ -12,13 +12,17 @@ License: PolyForm Noncommercial License 1.0.0
   delete and project statistics operations.
 """
 
+import asyncio
+import os
+import time
 from fastapi import APIRouter, HTTPException
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from app.schemas.project import Project, ProjectCreate, ProjectStats
 from app.dependencies import get_card_storage, get_canon_storage, get_draft_storage
 from app.utils.path_safety import sanitize_id, validate_path_within
+from app.utils.fast_json import FastJSONResponse
 from app.utils.language import normalize_language
 from pydantic import BaseModel, Field
 
@@ -32,8 +36,120 @@ card_storage = get_card_storage()
 canon_storage = get_canon_storage()
 draft_storage = get_draft_storage()
 
+# ========================================================================
+# project.yaml 解析缓存 / Parsed project.yaml cache
+# ========================================================================
+
+# path -> (st_mtime_ns, st_size, parsed data); a matching stat skips the YAML parse.
+_project_yaml_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+# Listing index: (data_dir st_mtime_ns, built-at monotonic time, project summaries).
+# Adding/removing a project dir bumps the data_dir mtime; in-app edits invalidate it
+# explicitly, and the TTL bounds staleness after out-of-band project.yaml edits.
+_project_index: Optional[Tuple[int, float, List[Dict[str, Any]]]] = None
+_PROJECT_INDEX_TTL_SECONDS = 30.0
+
+# Project skeleton, parents before children.
+_PROJECT_SUBDIRS = (
+    "cards",
+    os.path.join("cards", "characters"),
+    os.path.join("cards", "world"),
+    "canon",
+    "outline",
+    "drafts",
+    "summaries",
+    "traces",
+)
+
+# Upper bound on concurrent chapter reads in get_project_stats, to avoid FD exhaustion.
+_STATS_READ_CONCURRENCY = 32
+
+
+def _read_project_yaml(project_file: str) -> Dict[str, Any]:
+    """
+    读取 project.yaml，按 mtime/size 命中缓存 / Read project.yaml, served from cache when unchanged.
+
+    The returned dict is shared with the cache and must be treated as read-only.
+
+    Raises:
+        FileNotFoundError: 如果文件不存在 / If the file does not exist.
+    """
+    st = os.stat(project_file)
+    cached = _project_yaml_cache.get(project_file)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    data = card_storage.read_yaml_sync(project_file) or {}
+    _project_yaml_cache[project_file] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _invalidate_project_index() -> None:
+    global _project_index
+    _project_index = None
+
+
+def _project_summary(project_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """构建项目摘要响应 / Build the project summary returned by list/get/rename."""
+    return {
+        "id": project_id,
+        "name": data.get("name", project_id),
+        "description": data.get("description", ""),
+        "language": normalize_language(data.get("language"), default="zh"),
+        "created_at": data.get("created_at", ""),
+        "updated_at": data.get("updated_at", ""),
+    }
+
+
+def _is_junction(entry: os.DirEntry) -> bool:
+    """目录联接判断 / Whether the entry is an NTFS junction (never true before 3.12)."""
+    is_junction = getattr(entry, "is_junction", None)
+    return bool(is_junction and is_junction())
+
+
+def _fast_rmtree(path: str) -> None:
+    """
+    删除目录树 / Remove a directory tree.
+
+    Iterative post-order walk over os.scandir; file-vs-directory dispatch uses the
+    DirEntry's cached d_type, so entries are not lstat'ed a second time. Symlinks
+    and Windows junctions are unlinked, never followed; like shutil.rmtree, a linked
+    root is refused so the walk cannot empty the directory it points to.
+    """
+    isjunction = getattr(os.path, "isjunction", None)
+    if os.path.islink(path) or (isjunction is not None and isjunction(path)):
+        raise OSError(f"Cannot call rmtree on a symbolic link: {path}")
+    stack = [(path, False)]
+    while stack:
+        current, emptied = stack.pop()
+        if emptied:
+            os.rmdir(current)
+            continue
+        stack.append((current, True))
+        with os.scandir(current) as entries:
+            for entry in entries:
+                # On Windows (3.12+) a junction reports is_dir even without following
+                # links; descending into it would empty its target.
+                if entry.is_dir(follow_symlinks=False) and not _is_junction(entry):
+                    stack.append((entry.path, False))
+                else:
+                    os.unlink(entry.path)
+
+
+def _create_project_dirs(project_dir: Path) -> None:
+    """创建项目目录结构 / Create the project directory skeleton.
+
+    The root is created once; subdirectories are listed parent-first so each is a
+    single mkdir without re-walking its ancestors.
+    """
+    os.makedirs(project_dir, exist_ok=True)
+    for sub in _PROJECT_SUBDIRS:
+        try:
+            os.mkdir(project_dir / sub)
+        except FileExistsError:
+            pass
 
-@router.get("")
+
+@router.get("", response_class=FastJSONResponse)
 async def list_projects():
     """
     列出所有项目 / List all projects
@@ -43,27 +159,32 @@ async def list_projects():
     Returns:
         项目列表 / List of projects with id, name, description, timestamps.
     """
-    data_dir = Path(card_storage.data_dir)
-    
-    if not data_dir.exists():
+    global _project_index
+    data_dir = card_storage.data_dir
+
+    try:
+        dir_mtime_ns = os.stat(data_dir).st_mtime_ns
+    except FileNotFoundError:
         return []
-    
+    index = _project_index
+    if index and index[0] == dir_mtime_ns and time.monotonic() - index[1] < _PROJECT_INDEX_TTL_SECONDS:
+        return index[2]
+
     projects = []
-    for project_dir in data_dir.iterdir():
-        if project_dir.is_dir():
-            project_file = project_dir / "project.yaml"
-            if project_file.exists():
-                data = await card_storage.read_yaml(project_file)
-                language = normalize_language(data.get("language"), default="zh")
-                projects.append({
-                    "id": project_dir.name,
-                    "name": data.get("name", project_dir.name),
-                    "description": data.get("description", ""),
-                    "language": language,
-                    "created_at": data.get("created_at", ""),
-                    "updated_at": data.get("updated_at", "")
-                })
-    
+    try:
+        with os.scandir(data_dir) as entries:
+            project_entries = [entry for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+
+    for entry in project_entries:
+        try:
+            data = _read_project_yaml(os.path.join(entry.path, "project.yaml"))
+        except FileNotFoundError:
+            continue
+        projects.append(_project_summary(entry.name, data))
+
+    _project_index = (dir_mtime_ns, time.monotonic(), projects)
     return projects
 
 
@@ -94,17 +215,11 @@ async def create_project(project: ProjectCreate):
         raise HTTPException(status_code=400, detail="Project already exists")
     
     # Create project structure / 创建项目结构
-    card_storage.ensure_dir(project_dir / "cards" / "characters")
-    card_storage.ensure_dir(project_dir / "cards" / "world")
-    card_storage.ensure_dir(project_dir / "canon")
-    card_storage.ensure_dir(project_dir / "outline")
-    card_storage.ensure_dir(project_dir / "drafts")
-    card_storage.ensure_dir(project_dir / "summaries")
-    card_storage.ensure_dir(project_dir / "traces")
+    await asyncio.to_thread(_create_project_dirs, project_dir)
     
     # Save project metadata / 保存项目元数据
     now = datetime.now().isoformat()
-    lang_value = project.language if isinstance(project.language, str) else project.language.value
+    lang_value = project.language.value
     project_data = {
         "name": project.name,
         "description": project.description,
@@ -114,6 +229,7 @@ async def create_project(project: ProjectCreate):
     }
 
     await card_storage.write_yaml(project_dir / "project.yaml", project_data)
+    _invalidate_project_index()
 
     return {
         "id": project_id,
@@ -143,25 +259,16 @@ async def get_project(project_id: str):
         validate_path_within(project_dir, data_dir)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid project ID")
-    project_file = project_dir / "project.yaml"
 
-    if not project_file.exists():
+    try:
+        data = _read_project_yaml(str(project_dir / "project.yaml"))
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    data = await card_storage.read_yaml(project_file)
-    language = normalize_language(data.get("language"), default="zh")
-    
-    return {
-        "id": project_id,
-        "name": data.get("name", project_id),
-        "description": data.get("description", ""),
-        "language": language,
-        "created_at": data.get("created_at", ""),
-        "updated_at": data.get("updated_at", "")
-    }
+
+    return _project_summary(project_id, data)
 
 
-@router.get("/{project_id}/stats")
+@router.get("/{project_id}/stats", response_class=FastJSONResponse)
 async def get_project_stats(project_id: str):
     """
     Get project statistics
@@ -188,11 +295,16 @@ async def get_project_stats(project_id: str):
     # Calculate total word count / 计算总字数
     total_word_count = 0
     completed_chapters = 0
-    
-    for chapter in chapters:
-        final_draft = await draft_storage.get_final_draft(project_id, chapter)
-        if final_draft:
-            total_word_count += len(final_draft)
+    semaphore = asyncio.Semaphore(_STATS_READ_CONCURRENCY)
+
+    async def _bounded_final_length(chapter: str) -> int:
+        async with semaphore:
+            return await draft_storage.get_final_draft_length(project_id, chapter)
+
+    final_lengths = await asyncio.gather(*[_bounded_final_length(chapter) for chapter in chapters])
+    for length in final_lengths:
+        if length:
+            total_word_count += length
             completed_chapters += 1
     
     return {
@@ -216,8 +328,6 @@ async def delete_project(project_id: str):
     Returns:
         Deletion result / 删除结果
     """
-    import shutil
-
     data_dir = Path(card_storage.data_dir)
     project_dir = data_dir / project_id
     try:
@@ -228,7 +338,9 @@ async def delete_project(project_id: str):
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
-    shutil.rmtree(project_dir)
+    await asyncio.to_thread(_fast_rmtree, str(project_dir))
+    _project_yaml_cache.pop(str(project_dir / "project.yaml"), None)
+    _invalidate_project_index()
     
     return {"success": True, "message": "Project deleted"}
 
@@ -250,27 +362,18 @@ async def rename_project(project_id: str, request: ProjectRenameRequest):
         raise HTTPException(status_code=400, detail="Invalid project ID")
 
     project_file = project_dir / "project.yaml"
-    if not project_file.exists():
+    try:
+        data = card_storage.read_yaml_sync(project_file) or {}
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
 
     new_name = (request.name or "").strip()
     if not new_name:
         raise HTTPException(status_code=400, detail="Project name is required")
 
-    data = await card_storage.read_yaml(project_file) or {}
     data["name"] = new_name
     data["updated_at"] = datetime.now().isoformat()
     await card_storage.write_yaml(project_file, data)
+    _invalidate_project_index()
 
-    language = normalize_language(data.get("language"), default="zh")
-    return {
-        "success": True,
-        "project": {
-            "id": project_id,
-            "name": data.get("name", project_id),
-            "description": data.get("description", ""),
-            "language": language,
-            "created_at": data.get("created_at", ""),
-            "updated_at": data.get("updated_at", ""),
-        },
-    }
+    return {"success": True, "project": _project_summary(project_id, data)}
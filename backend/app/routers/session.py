@@ -12,21 +12,29 @@ License: PolyForm Noncommercial License 1.0.0
   feedback processing, and orchestrator lifecycle management.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import os
 import time
-from collections import OrderedDict
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from app.dependencies import get_card_storage
 from app.orchestrator import Orchestrator, SessionStatus
 from app.routers.websocket import broadcast_progress
 from app.schemas.draft import ChapterSummary
+from app.utils.fast_json import FastJSONResponse
 from app.utils.language import normalize_language
 from app.utils.text import normalize_for_compare
 
 router = APIRouter(tags=["session"])
 
+card_storage = get_card_storage()
+
+# Strong references to fire-and-forget tasks so they are not garbage-collected mid-flight.
+_background_tasks: Set[asyncio.Task] = set()
+
 # ========================================================================
 # 写作编排器管理 / Writing Orchestrator Management
 # ========================================================================
@@ -35,31 +43,104 @@ router = APIRouter(tags=["session"])
 # 每个项目独立的 orchestrator 实例池，带 TTL 淘汰
 _MAX_POOL_SIZE = 20
 _TTL_SECONDS = 3600  # 1 hour
-_orchestrators: OrderedDict[str, Orchestrator] = OrderedDict()
+_SWEEP_INTERVAL_SECONDS = 60
+_HIT_CEILING = 1 << 16  # halve all hit counters once any reaches this
+_orchestrators: Dict[str, Orchestrator] = {}
+_hits: Dict[str, int] = {}
+# Hit count observed at the last sweep; a change means the entry was used since then.
+_swept_hits: Dict[str, int] = {}
 _last_access: Dict[str, float] = {}
+_next_sweep_at = 0.0
+
+
+def _drop_orchestrator(project_id: str) -> None:
+    _orchestrators.pop(project_id, None)
+    _hits.pop(project_id, None)
+    _swept_hits.pop(project_id, None)
+    _last_access.pop(project_id, None)
 
 
 def _evict_stale() -> None:
     """删除超过TTL的编排器 / Remove orchestrators that have not been accessed within TTL.
 
-    Implements LRU eviction with TTL timeout. Removes stale instances and enforces
-    hard pool size limit.
+    Runs at most once per _SWEEP_INTERVAL_SECONDS. Hits are only counted on the
+    request path; an entry counts as accessed if its hit counter moved since the
+    previous sweep.
     """
+    global _next_sweep_at
     now = time.monotonic()
-    stale = [k for k, t in _last_access.items() if now - t > _TTL_SECONDS]
-    for k in stale:
-        _orchestrators.pop(k, None)
-        _last_access.pop(k, None)
-    # Also enforce hard cap
-    while len(_orchestrators) > _MAX_POOL_SIZE:
-        oldest_key, _ = _orchestrators.popitem(last=False)
-        _last_access.pop(oldest_key, None)
+    if now < _next_sweep_at:
+        return
+    _next_sweep_at = now + _SWEEP_INTERVAL_SECONDS
+    for k in list(_orchestrators):
+        hits = _hits.get(k, 0)
+        if hits != _swept_hits.get(k):
+            _swept_hits[k] = hits
+            _last_access[k] = now
+        elif now - _last_access.get(k, now) > _TTL_SECONDS:
+            _drop_orchestrator(k)
+
+
+# States in which an orchestrator holds no session worth keeping.
+_EVICTABLE_STATUSES = frozenset({SessionStatus.IDLE, SessionStatus.COMPLETED, SessionStatus.ERROR})
+
+
+def _eviction_key(project_id: str) -> Tuple[int, float]:
+    return _hits.get(project_id, 0), _last_access.get(project_id, 0.0)
+
+
+def _evict_least_used() -> None:
+    """按访问计数淘汰，为新实例腾出位置 / Evict the least-hit orchestrators to make room for a new one.
+
+    Orchestrators with a session in progress are skipped unless every entry is busy;
+    equal hit counts fall back to the oldest access, so a recent newcomer is not
+    evicted ahead of entries that have gone quiet.
+    """
+    while _orchestrators and len(_orchestrators) >= _MAX_POOL_SIZE:
+        idle = [k for k, o in _orchestrators.items() if o.current_status in _EVICTABLE_STATUSES]
+        _drop_orchestrator(min(idle or _orchestrators, key=_eviction_key))
+
+
+def _record_hit(project_id: str) -> None:
+    hits = _hits.get(project_id, 0) + 1
+    _hits[project_id] = hits
+    if hits >= _HIT_CEILING:
+        for k in _hits:
+            _hits[k] >>= 1
+        for k in _swept_hits:
+            _swept_hits[k] >>= 1
+
+
+# project_id -> (project.yaml st_mtime_ns, normalized language)
+_project_lang_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def _project_language(project_id: str) -> str:
+    """读取项目写作语言（按 mtime 缓存） / Read the project's writing language, cached by mtime.
+
+    Falls back to "zh" when project.yaml is missing or unreadable.
+    """
+    project_yaml = card_storage.get_project_path(project_id) / "project.yaml"
+    try:
+        mtime_ns = os.stat(project_yaml).st_mtime_ns
+    except OSError:
+        return "zh"
+    cached = _project_lang_cache.get(project_id)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        data = card_storage.read_yaml_sync(project_yaml) or {}
+    except Exception:
+        return "zh"
+    language = normalize_language(data.get("language"), default="zh")
+    _project_lang_cache[project_id] = (mtime_ns, language)
+    return language
 
 
 def get_orchestrator(project_id: str, request_language: Optional[str] = None) -> Orchestrator:
     """获取或创建项目的编排器实例 / Get or create orchestrator instance for a specific project.
 
-    Manages per-project orchestrator instances with LRU/TTL eviction.
+    Manages per-project orchestrator instances with hit-count/TTL eviction.
     Ensures each project has its own orchestrator with WebSocket progress callback.
 
     Args:
@@ -81,29 +162,20 @@ def get_orchestrator(project_id: str, request_language: Optional[str] = None) ->
     if explicit not in {"zh", "en"}:
         explicit = ""
 
-    if project_id not in _orchestrators:
+    orchestrator = _orchestrators.get(project_id)
+    if orchestrator is None:
         # Read language from project.yaml for bilingual support
-        language = "zh"
-        try:
-            from pathlib import Path
-            import yaml
-            from app.config import settings
-            project_yaml = Path(settings.data_dir) / project_id / "project.yaml"
-            if project_yaml.exists():
-                data = yaml.safe_load(project_yaml.read_text(encoding="utf-8")) or {}
-                language = normalize_language(data.get("language"), default="zh")
-        except Exception:
-            pass
-        if explicit:
-            language = explicit
-        _orchestrators[project_id] = Orchestrator(progress_callback=_progress_callback, language=language)
+        language = explicit or _project_language(project_id)
+        _evict_least_used()
+        orchestrator = Orchestrator(progress_callback=_progress_callback, language=language)
+        _orchestrators[project_id] = orchestrator
+        _last_access[project_id] = time.monotonic()
     else:
-        _orchestrators[project_id].progress_callback = _progress_callback
+        orchestrator.progress_callback = _progress_callback
         if explicit:
-            _orchestrators[project_id].set_language(explicit)
-        _orchestrators.move_to_end(project_id)
-    _last_access[project_id] = time.monotonic()
-    return _orchestrators[project_id]
+            orchestrator.set_language(explicit)
+    _record_hit(project_id)
+    return orchestrator
 
 
 class StartSessionRequest(BaseModel):
@@ -258,9 +330,11 @@ async def suggest_edit(project_id: str, request: EditSuggestRequest):
                 rejected_entities=request.rejected_entities or [],
                 memory_pack=memory_pack_payload,
             )
-        original_norm = normalize_for_compare(request.content)
-        revised_norm = normalize_for_compare(revised)
-        if revised_norm == original_norm:
+        # Byte-identical output is the common "no change" case; only normalize when it differs.
+        unchanged = revised == request.content or (
+            normalize_for_compare(revised) == normalize_for_compare(request.content)
+        )
+        if unchanged:
             return {
                 "success": False,
                 "error": "未能生成可应用的差异修改：请在指令中复制粘贴要修改的原句/段落，或使用\u201c选区编辑\u201d进行精确定位。",
@@ -275,7 +349,7 @@ async def suggest_edit(project_id: str, request: EditSuggestRequest):
 async def answer_questions(project_id: str, request: AnswerQuestionsRequest):
     """Continue session after answering pre-writing questions."""
     orchestrator = get_orchestrator(project_id, request.language)
-    answers = [item.model_dump() for item in request.answers]
+    answers = request.model_dump(include={"answers"})["answers"]
     return await orchestrator.answer_questions(
         project_id=project_id,
         chapter=request.chapter,
@@ -300,16 +374,21 @@ async def cancel_session(project_id: str):
     orchestrator.current_project_id = None
     orchestrator.current_chapter = None
 
-    await broadcast_progress(
-        project_id,
-        {
-            "status": SessionStatus.IDLE.value,
-            "message": "Session cancelled",
-            "project_id": project_id,
-            "chapter": None,
-            "iteration": 0,
-        },
+    # Don't hold the HTTP response on slow WebSocket clients.
+    task = asyncio.create_task(
+        broadcast_progress(
+            project_id,
+            {
+                "status": SessionStatus.IDLE.value,
+                "message": "Session cancelled",
+                "project_id": project_id,
+                "chapter": None,
+                "iteration": 0,
+            },
+        )
     )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
     return {"success": True, "message": "Session cancelled"}
 
@@ -395,28 +474,25 @@ async def save_analysis(project_id: str, request: SaveAnalysisRequest):
     )
 
 
-@router.post("/projects/{project_id}/session/analyze-sync")
+@router.post("/projects/{project_id}/session/analyze-sync", response_class=FastJSONResponse)
 async def analyze_sync(project_id: str, request: AnalyzeSyncRequest):
     """Batch analyze and overwrite summaries/facts/cards for selected chapters."""
     orchestrator = get_orchestrator(project_id, request.language)
     return await orchestrator.analyze_sync(project_id, request.chapters)
 
 
-@router.post("/projects/{project_id}/session/analyze-batch")
+@router.post("/projects/{project_id}/session/analyze-batch", response_class=FastJSONResponse)
 async def analyze_batch(project_id: str, request: AnalyzeBatchRequest):
     """Batch analyze chapters and return analysis payload."""
     orchestrator = get_orchestrator(project_id, request.language)
     return await orchestrator.analyze_batch(project_id, request.chapters)
 
 
-@router.post("/projects/{project_id}/session/save-analysis-batch")
+@router.post("/projects/{project_id}/session/save-analysis-batch", response_class=FastJSONResponse)
 async def save_analysis_batch(project_id: str, request: SaveAnalysisBatchRequest):
     """Persist analysis payload batch."""
     orchestrator = get_orchestrator(project_id, request.language)
-    items = [
-        {"chapter": item.chapter, "analysis": item.analysis.model_dump()}
-        for item in request.items
-    ]
+    items = request.model_dump(include={"items"})["items"]
     return await orchestrator.save_analysis_batch(
         project_id=project_id,
         items=items,
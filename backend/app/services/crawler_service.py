@@ -12,21 +12,428 @@ License: PolyForm Noncommercial License 1.0.0
 """
 
 import asyncio
+import codecs
+import json
+import os
 import re
-from typing import List, Dict, Any, Optional
-from urllib.parse import urljoin, urlparse, urldefrag, parse_qs, quote, unquote
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from html import unescape as html_unescape
+from html.parser import HTMLParser
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlunparse, urldefrag, parse_qs, quote, unquote
 
 import aiohttp
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from requests.utils import get_encoding_from_headers
+from urllib3.util.request import ACCEPT_ENCODING
 from urllib3.util.retry import Retry
 
 from app.utils.logger import get_logger
 from .wiki_parser import wiki_parser
 
+# orjson 为可选依赖，缺失时回退到标准库 / orjson is optional; fall back to stdlib json
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
 logger = get_logger(__name__)
 
+_DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+}
+
+
+# Transient statuses: retried by the sync session, and handed from the async batch path
+# to it so batch callers get the same retry policy.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _build_http_session() -> requests.Session:
+    """
+    构建共享的 HTTP 会话 / Build the shared keep-alive HTTP session.
+
+    The pool is sized for concurrent batch scraping against a handful of wiki hosts,
+    so repeat requests to a host reuse an open connection instead of re-handshaking.
+    """
+    session = requests.Session()
+    session.headers.update(_DEFAULT_HEADERS)
+    session.headers["Connection"] = "keep-alive"
+    # urllib3's list includes br/zstd only when the matching decoder is installed.
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+    retry = Retry(
+        total=4,
+        backoff_factor=0.6,
+        status_forcelist=list(_RETRY_STATUSES),
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=32, pool_maxsize=64, pool_block=False)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every CrawlerService instance so connection pools are reused across calls.
+_http_session = _build_http_session()
+
+_UTF8_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def _class_xpath(tag: str, cls: str) -> str:
+    return f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+_MW_OUTPUT_XPATH = _class_xpath("div", "mw-parser-output")
+_CONTENT_XPATHS = (
+    _MW_OUTPUT_XPATH,
+    ".//div[@id='mw-content-text']",
+    _class_xpath("div", "page-content"),
+    ".//article",
+    ".//main",
+    ".//body",
+)
+
+# Pre-compiled anchor selectors for the Moegirl link extractors. The list variant mirrors
+# CSS "li a[href]": the <li> may sit above the context node.
+# Noise filtering deliberately stays out of these expressions: the class checks are
+# case-insensitive substring matches, which XPath can only express via translate(), and
+# that costs more than the memoized per-element chain walk it would replace.
+_HREF_ANCHORS_XPATH = etree.XPath(".//a[@href]")
+_LIST_ANCHORS_XPATH = etree.XPath(".//a[@href][ancestor::li]")
+
+
+def _parse_html_tree(html: str) -> lxml_html.HtmlElement:
+    """
+    解析 HTML 为 lxml 文档树 / Parse HTML into an lxml document tree.
+
+    Always returns an <html> root (fragments are wrapped in <body>). Script and style
+    elements are emptied up front so text extraction matches bs4's get_text().
+    """
+    try:
+        tree = lxml_html.document_fromstring(html)
+    except ValueError:
+        # str input carrying an XML encoding declaration; lxml only accepts that as bytes.
+        tree = lxml_html.document_fromstring(html.encode("utf-8"), parser=_UTF8_HTML_PARSER)
+    except etree.ParserError:
+        tree = lxml_html.document_fromstring("<html><body></body></html>")
+    for node in list(tree.iter("script", "style")):
+        _drop_node(node)
+    return tree
+
+
+def _drop_node(node: lxml_html.HtmlElement) -> None:
+    """
+    从树中移除节点 / Remove a node from the tree.
+
+    The node is emptied and renamed rather than unlinked: unlinking would merge the
+    text on either side of it into one string, whereas bs4 keeps them as separate
+    strings (and get_text() puts a separator between them).
+    """
+    node.clear(keep_tail=True)
+    node.tag = "dropped"
+
+
+# Class-name fragments treated as page chrome when extracting text.
+_UNWANTED_CLASS_RE = re.compile(r"navbox|toc|sidebar|infobox|navigation|mw-editsection|reference", re.I)
+# _extract_text_from_tree: pruning queries (filtered in C, cheaper than a Python-level
+# walk on large pages) and the block tags text is read from.
+_TABLES_XPATH = etree.XPath(".//table")
+_LISTS_XPATH = etree.XPath(".//ul|.//ol")
+_TEXT_CHROME_XPATH = etree.XPath(".//nav|.//aside|.//footer|.//noscript")
+_CLASSED_XPATH = etree.XPath(".//*[@class]")
+_TEXT_BLOCK_TAGS = ("h1", "h2", "h3", "h4", "p", "li")
+_MOEGIRL_UNWANTED_CLASS_RE = re.compile(r"navbox|toc|mw-editsection|reference|reflist|catlinks", re.I)
+_MOEGIRL_UNWANTED_TAGS = frozenset({"nav", "aside", "footer", "script", "style", "noscript"})
+# Moegirl link pass, matched against lowercased class attributes: ancestors whose classes
+# mark template/navigation blocks, and ancestors that mark structured content.
+_MOEGIRL_NOISE_CLASS_RE = re.compile(
+    r"navbox|toc|catlinks|mw-references-wrap|reference|reflist|metadata|ambox|sistersitebox|noprint|portal"
+)
+_MOEGIRL_SIGNAL_CLASS_RE = re.compile(r"infobox|wikitable|basic-info")
+# Lowercased MediaWiki namespace prefixes (EN + CN) that are not article pages.
+_MEDIAWIKI_NAMESPACES = frozenset(
+    {
+        "special", "file", "talk", "template", "user", "help", "category", "module", "mediawiki",
+        "特殊", "文件", "讨论", "模板", "用户", "帮助", "分类", "模块", "媒体维基",
+    }
+)
+_MULTI_NEWLINE_RE = re.compile(r"\n{3,}")
+_MULTI_SPACE_RE = re.compile(r" {2,}")
+_INTRO_HEADING_RE = re.compile(r"(?m)^##\s*简介\s*\n")
+_TITLE_RE = re.compile(r"<title(?:\s[^>]*)?>(.*?)</title\s*>", re.I | re.S)
+# MediaWiki namespaces skipped by the generic link pass, matched anywhere in the href
+# (covers both /wiki/Special:X and ?title=Special:X); ASCII-only case folding.
+_SKIP_LINK_RE = re.compile(r"special:|file:|talk:|template:|user:", re.I | re.A)
+
+
+class _TitleFound(Exception):
+    """Raised by _TitleParser to stop tokenizing once </title> is seen."""
+
+
+class _TitleParser(HTMLParser):
+    """Streaming tokenizer that only collects the text of the first <title>."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._in_title = False
+        self._closed = False
+        self._chunks: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag == "title":
+            self._in_title = True
+            # Title content is raw text, as in a browser or lxml: markup inside it is not parsed.
+            self.set_cdata_mode(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title" and self._in_title:
+            self._closed = True
+            raise _TitleFound
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self._chunks.append(data)
+
+    def title_text(self) -> str:
+        text = "".join(self._chunks)
+        if self._in_title and not self._closed:
+            # An unterminated title runs to the end of the input, which the tokenizer
+            # keeps buffered while it waits for </title>.
+            text += self.rawdata
+        return html_unescape(text).strip()
+
+
+def _sniff_title(html: str) -> str:
+    """
+    从 HTML 头部提取页面标题 / Pull the page title out of the head of the document.
+
+    A regex over the first 5000 chars covers almost every page. When a <title> tag is
+    present but the regex cannot match it (e.g. cut off by the 5000-char window), a
+    streaming html.parser tokenizer reads up to </title> instead of building a tree.
+    """
+    head = html[:5000]
+    match = _TITLE_RE.search(head)
+    if match:
+        title = html_unescape(match.group(1)).strip()
+    elif "<title" in head.lower():
+        parser = _TitleParser()
+        try:
+            parser.feed(head)
+            parser.close()
+        except _TitleFound:
+            pass
+        title = parser.title_text()
+    else:
+        return ""
+    return title.split(" - ")[0]
+
+
+_META_CHARSET_RE = re.compile(rb'charset\s*=\s*["\']?([A-Za-z0-9_\-:.]+)', re.I)
+# Pages labelled gb2312 routinely contain GBK-only characters (browsers decode them as GBK).
+_CHARSET_ALIASES = {"gb2312": "gbk"}
+
+
+def _sniff_charset(raw: bytes) -> Optional[str]:
+    """
+    读取页面声明的字符集 / Charset declared in the first 2KB of the document.
+
+    Returns a normalized codec name, or None when nothing valid is declared.
+    """
+    match = _META_CHARSET_RE.search(raw, 0, 2048)
+    if not match:
+        return None
+    try:
+        name = codecs.lookup(match.group(1).decode("ascii")).name
+    except LookupError:
+        return None
+    return _CHARSET_ALIASES.get(name, name)
+
+
+# Hosts known to serve UTF-8 regardless of what their headers say.
+_UTF8_HOST_MARKERS = ("moegirl", "baike", "hudong", "zh.")
+
+
+def _is_utf8_host(netloc: str) -> bool:
+    """UTF-8 站点判断 / Whether the host is decoded as UTF-8 without detection."""
+    return any(marker in netloc for marker in _UTF8_HOST_MARKERS)
+
+
+def _decode_html(raw: bytes, declared: Optional[str], force_utf8: bool) -> str:
+    """
+    解码页面 HTML / Decode a fetched HTML body; shared by the sync and async scrapers.
+
+    ``declared`` is the header charset as requests reports it (ISO-8859-1 for a bare
+    text/* type, None when there is no Content-Type). Without a real header charset
+    the page's own <meta> declaration wins, then strict UTF-8, then the statistical
+    detector, which scans the whole body and so runs last.
+    """
+    if not raw:
+        return ""
+    encoding = declared
+    if force_utf8:
+        # Always UTF-8 on these hosts, whatever the headers say; nothing to sniff.
+        encoding = "utf-8"
+    elif not declared or declared.lower() in ("iso-8859-1", "ascii"):
+        encoding = _sniff_charset(raw)
+        if not encoding and declared:
+            try:
+                return raw.decode("utf-8")
+            except UnicodeDecodeError:
+                encoding = chardet.detect(raw)["encoding"] if chardet is not None else None
+        encoding = encoding or "utf-8"
+    try:
+        return str(raw, encoding or "utf-8", errors="replace")
+    except LookupError:
+        return str(raw, "utf-8", errors="replace")
+
+
+def _response_json(response: requests.Response) -> Any:
+    """
+    解析 API 响应 JSON / Decode a JSON API response.
+
+    MediaWiki APIs always answer in UTF-8, so the body is decoded from bytes without
+    requests' charset detection. orjson reads the raw bytes directly; anything it
+    rejects (e.g. invalid UTF-8) is decoded leniently and parsed by the stdlib.
+    """
+    if _orjson_available:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(response.content.decode("utf-8", errors="replace"))
+
+
+def _first(node: lxml_html.HtmlElement, xpath: str) -> Optional[lxml_html.HtmlElement]:
+    found = node.xpath(xpath)
+    return found[0] if found else None
+
+
+def _node_text(node: lxml_html.HtmlElement, separator: str = " ") -> str:
+    """lxml equivalent of bs4 ``get_text(separator, strip=True)``."""
+    return separator.join(text for text in (chunk.strip() for chunk in node.itertext()) if text)
+
+
+@lru_cache(maxsize=4096)
+def _moegirl_page_url(title: str, host: str = "mzh.moegirl.org.cn") -> str:
+    """
+    萌娘百科页面 URL（按标题缓存）/ Moegirl page URL, memoized per title.
+
+    Link extractors pass interned titles, so a title repeated across the list, API
+    and HTML link sets maps to one shared title object and one shared URL string.
+    """
+    safe = quote(title.replace(" ", "_"), safe="")
+    return f"https://{host}/index.php?title={safe}"
+
+
+def _moegirl_title_from_parsed(parsed) -> Optional[str]:
+    """萌娘百科链接指向的词条标题 / Article title named by a parsed Moegirl URL, if any."""
+    query = parsed.query
+    if query:
+        # Only `title` and `curid` matter, so the query is scanned in place instead of
+        # building a parse_qs dict; fields follow parse_qs (first non-blank value wins).
+        has_curid = False
+        for field in query.split("&"):
+            key, sep, value = field.partition("=")
+            if not value:
+                continue
+            if "%" in key or "+" in key:
+                key = unquote(key.replace("+", " "))
+            if key == "title":
+                return unquote(unquote(value.replace("+", " "))).strip() or None
+            if key == "curid":
+                has_curid = True
+        # Some MediaWiki links use page id instead of title (e.g. `?curid=123`).
+        # We can't resolve it without another API call; caller should fall back to anchor attributes.
+        if has_curid:
+            return None
+    # Common format: /<Title> or /wiki/<Title>
+    path_parts = parsed.path.strip("/").split("/")
+    if not path_parts or not path_parts[0]:
+        return None
+    if path_parts[0] == "wiki" and len(path_parts) > 1:
+        return unquote("/".join(path_parts[1:])).strip() or None
+    if path_parts[0] in {"api.php", "index.php"}:
+        return None
+    return unquote(parsed.path.strip("/")).strip() or None
+
+
+@lru_cache(maxsize=8192)
+def _moegirl_link_title(url: str) -> Optional[str]:
+    """
+    萌娘百科链接目标（按 URL 缓存）/ Link target of an absolute URL, memoized per URL.
+
+    Returns "" for non-Moegirl hosts, None for Moegirl URLs that name no article (the
+    caller falls back to anchor attributes), otherwise the article title. The same
+    article links recur across pages, so repeats skip urlparse and query scanning.
+    """
+    parsed = urlparse(url)
+    if "moegirl.org" not in parsed.netloc.lower():
+        return ""
+    return _moegirl_title_from_parsed(parsed)
+
+
+@lru_cache(maxsize=2048)
+def _mediawiki_title_of(path: str, query: str) -> Optional[str]:
+    """MediaWiki 页面标题（按 path/query 缓存）/ Article title of a MediaWiki URL, memoized."""
+    if "index.php" in path:
+        query_params = parse_qs(query)
+        title = query_params.get("title", [None])[0]
+        return unquote(title) if title else None
+
+    path_parts = path.strip("/").split("/")
+    if not path_parts:
+        return None
+    if path_parts[0] == "wiki" and len(path_parts) > 1:
+        return unquote("/".join(path_parts[1:]))
+    if path_parts[0] != "index.php":
+        return unquote(path.strip("/"))
+    return None
+
+
+@lru_cache(maxsize=2048)
+def _mediawiki_api_url_of(scheme: str, netloc: str, path: str) -> str:
+    """MediaWiki api.php 地址（按站点与路径缓存）/ api.php URL of a MediaWiki page, memoized."""
+    path_parts = path.strip("/").split("/")
+    lang_prefix = ""
+    if len(path_parts) > 0 and len(path_parts[0]) == 2 and path_parts[0] != "wiki":
+        lang_prefix = f"/{path_parts[0]}"
+    return f"{scheme}://{netloc}{lang_prefix}/api.php"
+
+
+def _is_moegirl_unwanted(tag) -> bool:
+    """
+    萌娘百科正文清理的 bs4 过滤器 / bs4 filter for Moegirl content cleanup.
+
+    Matches chrome tags and _MOEGIRL_UNWANTED_CLASS_RE classes in one find_all() walk.
+    The class test mirrors bs4's own class_ matching: each class, then the joined value.
+    """
+    if tag.name in _MOEGIRL_UNWANTED_TAGS:
+        return True
+    classes = tag.get("class")
+    if not classes:
+        return False
+    if any(_MOEGIRL_UNWANTED_CLASS_RE.search(cls) for cls in classes):
+        return True
+    return len(classes) > 1 and _MOEGIRL_UNWANTED_CLASS_RE.search(" ".join(classes)) is not None
+
 
 class CrawlerService:
     """
@@ -41,6 +448,12 @@ class CrawlerService:
         MAX_LLM_CHARS: LLM 处理的最大字符数 (Max characters for LLM input)
         MAX_LINKS: 通用最大链接数 (Max links for generic sites)
         MOEGIRL_MAX_LINKS: 萌娘百科特定最大链接数 (Moegirl-specific max links)
+        SCRAPE_CACHE_SIZE: 爬取结果缓存条目上限 (Max cached scrape results)
+        SCRAPE_CACHE_TTL_SECONDS: 爬取结果缓存有效期 (Scrape result cache TTL)
+        MOEGIRL_PARSE_CACHE_SIZE: 萌娘百科 action=parse 响应缓存条目上限 (Max cached Moegirl parse responses)
+        MAX_HTML_BYTES: 异步抓取的页面字节上限 (Max HTML bytes read per page on the async path)
+        PROCESS_PARSE_MIN_CHARS: 超过该长度的页面在进程池中解析 (Pages at least this long are parsed in a process pool)
+        BLOCKING_WORKERS: 爬虫专用线程池大小 (Size of the crawler's own thread pool)
     """
 
     MAX_PREVIEW_CHARS = 1200
@@ -49,56 +462,64 @@ class CrawlerService:
     MOEGIRL_MAX_LINKS = 900
     MOEGIRL_API_PRIMARY = "https://mzh.moegirl.org.cn/api.php"
     MOEGIRL_API_FALLBACK = "https://zh.moegirl.org.cn/api.php"
+    SCRAPE_CACHE_SIZE = 512
+    SCRAPE_CACHE_TTL_SECONDS = 600
+    MOEGIRL_PARSE_CACHE_SIZE = 64
+    MAX_HTML_BYTES = 4 * 1024 * 1024
+    PROCESS_PARSE_MIN_CHARS = 256_000
+    BLOCKING_WORKERS = 16
+
+    # Host substring -> scraper method, first match wins; other hosts use _scrape_html.
+    # The catch-all "wiki" also covers huijiwiki.com.
+    _DOMAIN_HANDLERS: Tuple[Tuple[str, str], ...] = (
+        ("fandom.com", "_scrape_mediawiki_parse"),
+        ("moegirl.org", "_scrape_moegirl"),
+        ("wikipedia.org", "_scrape_wikipedia"),
+        ("wiki", "_scrape_mediawiki_parse"),
+    )
 
     def __init__(self):
-        self.headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            )
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-
-        retry = Retry(
-            total=4,
-            backoff_factor=0.6,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-        )
-        adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self.headers = dict(_DEFAULT_HEADERS)
+        self.session = _http_session
+
+        # Normalized URL -> (stored-at monotonic time, result), least recently used first.
+        # Batch scraping calls scrape_page from worker threads, hence the lock.
+        self._scrape_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._scrape_cache_lock = threading.Lock()
+        # (api_url, title) -> (stored-at monotonic time, parse JSON), same TTL and lock. Catches
+        # one article reached through different URL forms (zh/mzh host, /Title vs ?title=).
+        # Entries carry the full article HTML, hence the smaller bound.
+        self._moegirl_parse_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # (api_url, title) -> event set when the in-progress fetch for that key finishes, so
+        # concurrent batch scrapes of one article share a single API round trip.
+        self._moegirl_parse_inflight: Dict[Tuple[str, str], threading.Event] = {}
+
+        # Lazily created on first batch scrape (needs a running loop); closed via aclose().
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        # Lazily created for large pages on the async path; shut down via aclose().
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # Blocking scrapes/parses from the async path; kept across batches so worker
+        # threads are reused, and separate from the loop's default executor.
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def scrape_page(self, url: str) -> Dict[str, Any]:
         """
         Scrape a Wiki page and extract main content.
         Uses API when available, falls back to HTML scraping.
+        Successful results are cached per normalized URL (see clear_cache).
         """
+        cache_key = self._scrape_cache_key(url)
+        cached = self._get_cached_scrape(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-
-            if "fandom.com" in domain:
-                result = self._scrape_mediawiki_parse(url, parsed)
-            elif "moegirl.org" in domain:
-                result = self._scrape_moegirl(url, parsed)
-            elif "wikipedia.org" in domain:
-                result = self._scrape_wikipedia(url, parsed)
-            elif "huijiwiki.com" in domain or "wiki" in domain:
-                result = self._scrape_mediawiki_parse(url, parsed)
-            else:
-                result = self._scrape_html(url)
-
-            if result.get("success", False):
-                if not result.get("content") and not result.get("links"):
-                    result["content"] = (
-                        f"Page Title: {result.get('title', 'Unknown')}\n\n"
-                        "This page has no extractable text. Please open it in a browser."
-                    )
-                    result["links"] = []
+            handler = self._domain_handler(parsed.netloc)
+            result = getattr(self, handler or "_scrape_html")(url, parsed)
 
+            result = self._finalize_scrape(result)
+            self._store_scrape(cache_key, result)
             return result
 
         except Exception as exc:
@@ -111,56 +532,72 @@ class CrawlerService:
                 "llm_content": "",
             }
 
+    def _domain_handler(self, netloc: str) -> Optional[str]:
+        """Name of the API scraper for this host, or None for plain HTML scraping."""
+        domain = netloc.lower()
+        for needle, handler in self._DOMAIN_HANDLERS:
+            if needle in domain:
+                return handler
+        return None
+
+    def _finalize_scrape(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result.get("success", False):
+            if not result.get("content") and not result.get("links"):
+                result["content"] = (
+                    f"Page Title: {result.get('title', 'Unknown')}\n\n"
+                    "This page has no extractable text. Please open it in a browser."
+                )
+                result["links"] = []
+        return result
+
+    def _scrape_cache_key(self, url: str) -> str:
+        parsed = urlparse(str(url or "").strip())
+        # Scheme and host are case-insensitive; MediaWiki titles in path/query are not.
+        return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, parsed.params, parsed.query, ""))
+
+    def _get_cached_scrape(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._scrape_cache_lock:
+            entry = self._scrape_cache.get(cache_key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.SCRAPE_CACHE_TTL_SECONDS:
+                del self._scrape_cache[cache_key]
+                return None
+            self._scrape_cache.move_to_end(cache_key)
+            return dict(entry[1])
+
+    def _store_scrape(self, cache_key: str, result: Dict[str, Any]) -> None:
+        if not result.get("success"):
+            return
+        with self._scrape_cache_lock:
+            self._scrape_cache[cache_key] = (time.monotonic(), dict(result))
+            self._scrape_cache.move_to_end(cache_key)
+            while len(self._scrape_cache) > self.SCRAPE_CACHE_SIZE:
+                self._scrape_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """清空爬取结果缓存 / Drop all cached scrape results and API responses."""
+        with self._scrape_cache_lock:
+            self._scrape_cache.clear()
+            self._moegirl_parse_cache.clear()
+
     def _normalize_url(self, url: str) -> str:
         if not url:
             return ""
         normalized, _ = urldefrag(url.strip())
         return normalized
 
-    def _is_moegirl_domain(self, netloc: str) -> bool:
-        host = (netloc or "").lower()
-        return "moegirl.org" in host or "moegirl.org.cn" in host
-
-    def _moegirl_article_title_from_url(self, parsed) -> Optional[str]:
-        query_params = parse_qs(parsed.query or "")
-        title = query_params.get("title", [None])[0]
-        if title:
-            return unquote(title).strip() or None
-        # Some MediaWiki links use page id instead of title (e.g. `?curid=123`).
-        # We can't resolve it without another API call; caller should fall back to anchor attributes.
-        if query_params.get("curid", [None])[0]:
-            return None
-        # Common format: /<Title> or /wiki/<Title>
-        path_parts = parsed.path.strip("/").split("/")
-        if not path_parts or not path_parts[0]:
-            return None
-        if path_parts[0] == "wiki" and len(path_parts) > 1:
-            return unquote("/".join(path_parts[1:])).strip() or None
-        if path_parts[0] in {"api.php", "index.php"}:
-            return None
-        return unquote(parsed.path.strip("/")).strip() or None
-
     def _build_moegirl_page_url(self, title: str) -> str:
-        safe = quote(str(title or "").replace(" ", "_"), safe="")
-        return f"https://mzh.moegirl.org.cn/index.php?title={safe}"
+        return _moegirl_page_url(str(title or ""))
 
     def _is_mediawiki_namespace_title(self, title: str) -> bool:
         """Filter out non-article namespaces (Category/File/Special/模板/分类等)."""
-        t = str(title or "").strip()
-        if not t or ":" not in t:
-            return False
-        prefix = t.split(":", 1)[0].strip().lower()
-        # EN namespaces
-        if prefix in {"special", "file", "talk", "template", "user", "help", "category", "module", "mediawiki"}:
-            return True
-        # CN namespaces
-        if prefix in {"特殊", "文件", "讨论", "模板", "用户", "帮助", "分类", "模块", "媒体维基"}:
-            return True
-        return False
+        prefix, sep, _ = str(title or "").partition(":")
+        return bool(sep) and prefix.strip().lower() in _MEDIAWIKI_NAMESPACES
 
     def _extract_moegirl_list_links_from_html(
         self,
-        content_root: BeautifulSoup,
+        content_root: Optional[lxml_html.HtmlElement],
         base_url: str,
     ) -> List[Dict[str, str]]:
         """
@@ -171,26 +608,26 @@ class CrawlerService:
         """
         links: List[Dict[str, str]] = []
         seen = set()
+        # The outcome depends on the href alone, so a repeated href is skipped unparsed.
+        seen_href = set()
 
-        if not content_root:
+        if content_root is None:
             return links
 
-        for a in content_root.select("li a[href]")[: self.MOEGIRL_MAX_LINKS * 10]:
+        for a in _LIST_ANCHORS_XPATH(content_root)[: self.MOEGIRL_MAX_LINKS * 10]:
             href = str(a.get("href") or "").strip()
-            if not href or href.startswith("#"):
+            if not href or href.startswith("#") or href in seen_href:
                 continue
+            seen_href.add(href)
             abs_url = self._normalize_url(urljoin(base_url, href))
             if not abs_url:
                 continue
 
-            parsed = urlparse(abs_url)
-            if not self._is_moegirl_domain(parsed.netloc):
-                continue
-
-            title = self._moegirl_article_title_from_url(parsed)
+            title = _moegirl_link_title(abs_url)
             if not title or self._is_mediawiki_namespace_title(title):
                 continue
 
+            title = sys.intern(title)
             final_url = self._build_moegirl_page_url(title)
             if final_url in seen:
                 continue
@@ -203,7 +640,7 @@ class CrawlerService:
 
     def _extract_moegirl_outgoing_links_from_html(
         self,
-        content_root: BeautifulSoup,
+        content_root: Optional[lxml_html.HtmlElement],
         base_url: str,
         cap: int,
     ) -> List[Dict[str, str]]:
@@ -215,104 +652,116 @@ class CrawlerService:
 
         重要：这里的“提及”指正文/信息框/列表/表格/标题等内容结构中的链接，不包含导航模板、目录、分类、参考文献等模板区块链接。
         """
-        if not content_root:
+        candidates = self._score_moegirl_outgoing_links(content_root, base_url, cap)
+        return [{"title": item["title"], "url": item["url"]} for item in candidates[:cap]]
+
+    def _score_moegirl_outgoing_links(
+        self,
+        content_root: Optional[lxml_html.HtmlElement],
+        base_url: str,
+        cap: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scored outgoing-link candidates ({"title", "url", "score"}), best first.
+
+        Collection stops once ``cap * 2`` candidates are found.
+        """
+        if content_root is None:
             return []
 
-        links: List[Dict[str, str]] = []
         seen = set()
 
-        def is_noise_anchor(anchor) -> bool:
-            classes = anchor.get("class") or []
-            if isinstance(classes, str):
-                classes = [classes]
-            cls_join = " ".join([str(c) for c in classes]).lower()
+        # Element -> (inside a noise block, signal score), derived from the element and its
+        # ancestors. Anchors in the same list/table share a parent chain, so each chain is
+        # classified once instead of being re-walked per anchor.
+        chain_state: Dict[lxml_html.HtmlElement, Tuple[bool, int]] = {}
+
+        def classify_chain(node: Optional[lxml_html.HtmlElement]) -> Tuple[bool, int]:
+            pending = []
+            while node is not None and node not in chain_state:
+                pending.append(node)
+                node = node.getparent()
+            noise, score = chain_state[node] if node is not None else (False, 0)
+            for elem in reversed(pending):
+                pcls = (elem.get("class") or "").lower()
+                # Drop anchors inside heavy template/navigation blocks that bring unrelated
+                # pages (vertical-navbox is covered by navbox).
+                if (
+                    elem.tag in {"nav", "footer"}
+                    or elem.get("role") == "navigation"
+                    or (pcls and _MOEGIRL_NOISE_CLASS_RE.search(pcls))
+                ):
+                    noise = True
+                # The nearest ancestor marking a content structure decides the score: higher
+                # score = more likely the page "mentions" this term.
+                if elem.tag == "table":
+                    score = 3
+                elif elem.tag in {"p", "li", "dd", "dt", "h1", "h2", "h3", "h4", "h5", "h6"}:
+                    score = 2
+                elif pcls and _MOEGIRL_SIGNAL_CLASS_RE.search(pcls):
+                    score = 3
+                chain_state[elem] = (noise, score)
+            return chain_state[pending[0]] if pending else (noise, score)
+
+        def is_noise_anchor(anchor: lxml_html.HtmlElement) -> bool:
+            cls_join = (anchor.get("class") or "").lower()
             # Red links / non-existing pages
             if "new" in cls_join:
                 return True
             # External links within the page content
             if "external" in cls_join:
                 return True
+            return classify_chain(anchor.getparent())[0]
 
-            # Drop anchors inside heavy template/navigation blocks that bring unrelated pages.
-            noise_class_patterns = [
-                "navbox",
-                "vertical-navbox",
-                "toc",
-                "catlinks",
-                "mw-references-wrap",
-                "reference",
-                "reflist",
-                "metadata",
-                "ambox",
-                "sistersitebox",
-                "noprint",
-                "portal",
-            ]
-            for parent in anchor.parents:
-                if getattr(parent, "name", None) is None:
-                    continue
-                if parent.name in {"nav", "footer"}:
-                    return True
-                if parent.get("role") == "navigation":
-                    return True
-                pcls = parent.get("class") or []
-                if isinstance(pcls, str):
-                    pcls = [pcls]
-                pcls_join = " ".join([str(c) for c in pcls]).lower()
-                if any(p in pcls_join for p in noise_class_patterns):
-                    return True
-            return False
+        def signal_score(anchor: lxml_html.HtmlElement) -> int:
+            # 0 = not in a "content mention" structure; treated as noise to avoid pulling
+            # global/site/template links.
+            return classify_chain(anchor.getparent())[1]
 
-        def signal_score(anchor) -> int:
-            """
-            Score anchors by whether they appear in main text/table/list structures.
-            Higher score = more likely the page "mentions" this term.
-            """
-            for parent in anchor.parents:
-                if getattr(parent, "name", None) is None:
-                    continue
-                if parent.name == "table":
-                    return 3
-                if parent.name in {"p", "li", "dd", "dt", "h1", "h2", "h3", "h4", "h5", "h6"}:
-                    return 2
-                pcls = parent.get("class") or []
-                if isinstance(pcls, str):
-                    pcls = [pcls]
-                pcls_join = " ".join([str(c) for c in pcls]).lower()
-                if "infobox" in pcls_join or "wikitable" in pcls_join or "basic-info" in pcls_join:
-                    return 3
-            # Not in a "content mention" structure; treat as noise to avoid pulling global/site/template links.
-            return 0
+        # Titles repeat across hrefs and anchor fallbacks (a fallback title is checked twice).
+        namespace_titles: Dict[str, bool] = {}
+
+        def is_namespace(title: str) -> bool:
+            result = namespace_titles.get(title)
+            if result is None:
+                result = namespace_titles[title] = self._is_mediawiki_namespace_title(title)
+            return result
+
+        # href -> title parsed from it (None: unresolved, "": rejected URL). A repeat of a
+        # resolved or rejected href always ends up skipped, so only unresolved hrefs, whose
+        # title falls back to the anchor itself, are looked at again.
+        href_titles: Dict[str, Optional[str]] = {}
 
         candidates: List[Dict[str, Any]] = []
-        for a in content_root.find_all("a", href=True):
+        for a in _HREF_ANCHORS_XPATH(content_root):
             if is_noise_anchor(a):
                 continue
             href = str(a.get("href") or "").strip()
             if not href or href.startswith("#"):
                 continue
-            abs_url = self._normalize_url(urljoin(base_url, href))
-            if not abs_url:
-                continue
-
-            parsed = urlparse(abs_url)
-            if not self._is_moegirl_domain(parsed.netloc):
-                continue
-
-            title = self._moegirl_article_title_from_url(parsed)
+            if href in href_titles:
+                if href_titles[href] is not None:
+                    continue
+                title = None
+            else:
+                abs_url = self._normalize_url(urljoin(base_url, href))
+                title = href_titles[href] = _moegirl_link_title(abs_url) if abs_url else ""
+                if title == "":
+                    continue
             if not title:
                 # Fallback 1: MediaWiki often sets `<a title="词条名">` even when text is empty/image-only.
                 title_attr = str(a.get("title") or "").strip()
-                if title_attr and not self._is_mediawiki_namespace_title(title_attr):
+                if title_attr and not is_namespace(title_attr):
                     title = title_attr
             if not title:
                 # Fallback 2: use visible text as last resort
-                text_title = a.get_text(" ", strip=True)
-                if 1 < len(text_title) <= 30 and not self._is_mediawiki_namespace_title(text_title):
+                text_title = _node_text(a)
+                if 1 < len(text_title) <= 30 and not is_namespace(text_title):
                     title = text_title
-            if not title or self._is_mediawiki_namespace_title(title):
+            if not title or is_namespace(title):
                 continue
 
+            title = sys.intern(title)
             final_url = self._build_moegirl_page_url(title)
             if final_url in seen:
                 continue
@@ -321,12 +770,14 @@ class CrawlerService:
             if score <= 0:
                 continue
             candidates.append({"title": title, "url": final_url, "score": score})
+            # Twice the cap leaves room for the ranking below; anchors past that point are
+            # not walked at all on very link-dense pages.
+            if len(candidates) >= cap * 2:
+                break
 
         # Prefer links that appear in tables/main text, then fill with the rest.
         candidates.sort(key=lambda x: (-int(x.get("score") or 0), x.get("title") or ""))
-        for item in candidates[:cap]:
-            links.append({"title": item["title"], "url": item["url"]})
-        return links
+        return candidates
 
     def _fetch_moegirl_html_outgoing_links(self, page_url: str, cap: int) -> List[Dict[str, str]]:
         """
@@ -347,9 +798,8 @@ class CrawlerService:
             logger.warning("Moegirl HTML fallback fetch failed url=%s err=%s", url, exc)
             return []
 
-        soup = BeautifulSoup(html, "lxml")
-        content_root = soup.find("div", class_="mw-parser-output")
-        if not content_root:
+        content_root = _first(_parse_html_tree(html), _MW_OUTPUT_XPATH)
+        if content_root is None:
             # 避免退回到 body 把整站 header/footer/sidebar 的链接一并抓进来，导致“无关词条”。
             # 找不到正文容器时直接放弃兜底链接，宁可少也不要脏。
             return []
@@ -358,7 +808,7 @@ class CrawlerService:
     def _is_probably_moegirl_list_page(
         self,
         title: str,
-        content_root: BeautifulSoup,
+        content_root: Optional[lxml_html.HtmlElement],
         list_links: List[Dict[str, str]],
     ) -> bool:
         """Heuristic list-page detector for Moegirlpedia."""
@@ -366,22 +816,22 @@ class CrawlerService:
         if any(k in t for k in ["列表", "目录", "条目", "登场人物", "角色列表", "人物列表", "角色表"]):
             return True
 
-        if not content_root:
+        # Both structural rules below need at least 12 list-links; check the cheap bound first.
+        if content_root is None or len(list_links) < 12:
             return False
 
-        li_count = len(content_root.find_all("li"))
+        # Only "at most 6" / "at most 4" matter, so counting stops at 7.
         paragraph_count = 0
-        for p in content_root.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if len(text) >= 60:
+        for p in content_root.iter("p"):
+            if len(_node_text(p)) >= 60:
                 paragraph_count += 1
-            if paragraph_count >= 8:
-                break
+                if paragraph_count > 6:
+                    break
 
         # List pages: many list items, few paragraphs, many list-links
         if len(list_links) >= 30 and paragraph_count <= 6:
             return True
-        if li_count >= 50 and paragraph_count <= 4 and len(list_links) >= 12:
+        if paragraph_count <= 4 and content_root.xpath("count(.//li)") >= 50:
             return True
         return False
 
@@ -423,6 +873,63 @@ class CrawlerService:
     # 注意：子词条（links）严格定义为“页面中提及并带链接的词条”。
     # 因此不从分类/反链等召回“相关但未提及”的页面，避免引入无关词条。
 
+    def _fetch_moegirl_parse(self, api_url: str, title: str) -> Dict[str, Any]:
+        """
+        获取 action=parse 结果 / Fetch the action=parse JSON for a title, cached per (api_url, title).
+
+        The returned dict is shared with the cache and must be treated as read-only.
+        Concurrent calls for the same key wait for the first one's response instead of
+        issuing their own; if it fails, the next waiter retries.
+
+        Raises:
+            requests.RequestException: 请求失败 / On HTTP or network errors.
+            ValueError: API 返回错误 / If the API reports an error.
+        """
+        key = (api_url, title)
+        while True:
+            with self._scrape_cache_lock:
+                entry = self._moegirl_parse_cache.get(key)
+                if entry is not None:
+                    if time.monotonic() - entry[0] <= self.SCRAPE_CACHE_TTL_SECONDS:
+                        self._moegirl_parse_cache.move_to_end(key)
+                        return entry[1]
+                    del self._moegirl_parse_cache[key]
+                pending = self._moegirl_parse_inflight.get(key)
+                if pending is None:
+                    done = self._moegirl_parse_inflight[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            data = self._request_moegirl_parse(api_url, title)
+            with self._scrape_cache_lock:
+                self._moegirl_parse_cache[key] = (time.monotonic(), data)
+                self._moegirl_parse_cache.move_to_end(key)
+                while len(self._moegirl_parse_cache) > self.MOEGIRL_PARSE_CACHE_SIZE:
+                    self._moegirl_parse_cache.popitem(last=False)
+        finally:
+            with self._scrape_cache_lock:
+                del self._moegirl_parse_inflight[key]
+            done.set()
+        return data
+
+    def _request_moegirl_parse(self, api_url: str, title: str) -> Dict[str, Any]:
+        params = {
+            "action": "parse",
+            "page": title,
+            "prop": "text|links|categories|sections",
+            "format": "json",
+            "formatversion": "2",
+            "redirects": "1",
+            "disablelimitreport": "1",
+        }
+        response = self.session.get(api_url, params=params, timeout=(6, 20))
+        response.raise_for_status()
+        data = _response_json(response)
+        if "error" in data:
+            raise ValueError(str(data.get("error")))
+        return data
+
     def _scrape_moegirl(self, url: str, parsed) -> Dict[str, Any]:
         """
         Moegirlpedia specialized scraper.
@@ -431,28 +938,13 @@ class CrawlerService:
         """
         normalized_url = self._normalize_url(url)
         parsed = urlparse(normalized_url) if normalized_url else parsed
-        title = self._moegirl_article_title_from_url(parsed)
+        title = _moegirl_title_from_parsed(parsed)
         if not title:
-            return self._scrape_html(normalized_url or url)
+            return self._scrape_html(normalized_url or url, parsed)
 
         for api_url in [self.MOEGIRL_API_PRIMARY, self.MOEGIRL_API_FALLBACK]:
             try:
-                params = {
-                    "action": "parse",
-                    "page": title,
-                    "prop": "text|links|categories|sections",
-                    "format": "json",
-                    "formatversion": "2",
-                    "redirects": "1",
-                    "disablelimitreport": "1",
-                }
-                response = self.session.get(api_url, params=params, timeout=(6, 20))
-                response.raise_for_status()
-                response.encoding = "utf-8"
-                data = response.json()
-                if "error" in data:
-                    raise ValueError(str(data.get("error")))
-
+                data = self._fetch_moegirl_parse(api_url, title)
                 parse_data = data.get("parse") or {}
                 display_title = str(parse_data.get("title") or title).strip() or title
                 html_content = str(parse_data.get("text") or "")
@@ -460,41 +952,50 @@ class CrawlerService:
                     raise ValueError("empty_parse_text")
 
                 # 重要：链接抽取使用“原始 parse HTML”（不做清理），否则会误删导航模板/目录等导致子词条显著变少。
-                soup_raw = BeautifulSoup(html_content, "lxml")
-                content_root_raw = soup_raw.find("div", class_="mw-parser-output") or soup_raw
+                # The link/list-page heuristics only read the tree, so they run on lxml directly.
+                tree_raw = _parse_html_tree(html_content)
+                content_root_raw = _first(tree_raw, _MW_OUTPUT_XPATH)
+                if content_root_raw is None:
+                    content_root_raw = tree_raw
 
                 # 内容/预览用于建卡：仍做清理，减少噪声并把高价值信息置顶。
+                # No SoupStrainer here: the parse text *is* the mw-parser-output container,
+                # so straining prunes nothing and only adds per-tag match overhead.
                 soup = BeautifulSoup(html_content, "lxml")
                 content_root = soup.find("div", class_="mw-parser-output") or soup
-                for unwanted in content_root.find_all(
-                    ["nav", "aside", "footer", "script", "style", "noscript"]
-                ):
+                for unwanted in content_root.find_all(_is_moegirl_unwanted):
                     unwanted.decompose()
-                for cls in ["navbox", "toc", "mw-editsection", "reference", "reflist", "catlinks"]:
-                    for elem in content_root.find_all(class_=re.compile(cls, re.I)):
-                        elem.decompose()
 
-                parsed_data = wiki_parser.parse_page(str(content_root), title=display_title)
+                parsed_data = wiki_parser.parse_page_soup(content_root, title=display_title)
                 llm_content = self._format_moegirl_llm_content(parsed_data, content_root, parse_data)
                 preview_content = wiki_parser.format_for_preview(parsed_data, max_chars=self.MAX_PREVIEW_CHARS)
                 if not preview_content:
                     preview_content = llm_content[: self.MAX_PREVIEW_CHARS]
 
                 base_page_url = self._build_moegirl_page_url(display_title)
-                html_links = self._extract_moegirl_outgoing_links_from_html(
+                candidates = self._score_moegirl_outgoing_links(
                     content_root_raw,
                     base_page_url,
                     cap=self.MOEGIRL_MAX_LINKS,
                 )
+                html_links = [
+                    {"title": item["title"], "url": item["url"]}
+                    for item in candidates[: self.MOEGIRL_MAX_LINKS]
+                ]
                 is_list_page = self._is_probably_moegirl_list_page(display_title, content_root_raw, html_links)
 
                 links = (html_links or [])[: self.MOEGIRL_MAX_LINKS]
+                # Links from tables/infoboxes (score 3): plenty of them means the parse HTML
+                # already carries the page's real link structure.
+                strong_count = sum(1 for item in candidates if item["score"] >= 3)
 
                 # 若依旧异常偏少（与用户预期不符），用“页面 HTML”兜底抽一次。
                 html_fallback_links: List[Dict[str, str]] = []
-                if len(links) < 80:
+                if len(links) < 80 and strong_count < 40:
+                    # Same host as the API that just answered: its keep-alive connection is
+                    # reused, and a primary host that already failed is not hit again.
                     html_fallback_links = self._fetch_moegirl_html_outgoing_links(
-                        base_page_url,
+                        _moegirl_page_url(display_title, urlparse(api_url).netloc),
                         cap=self.MOEGIRL_MAX_LINKS,
                     )
                     if html_fallback_links:
@@ -525,7 +1026,7 @@ class CrawlerService:
                 continue
 
         # Final fallback: direct HTML
-        return self._scrape_html(normalized_url or url)
+        return self._scrape_html(normalized_url or url, parsed)
 
     def _extract_moegirl_links(self, parse_data: Dict[str, Any]) -> List[Dict[str, str]]:
         raw_links = parse_data.get("links") or []
@@ -561,6 +1062,7 @@ class CrawlerService:
                 for prefix in ["special:", "file:", "talk:", "template:", "user:", "help:", "category:"]
             ):
                 continue
+            name = sys.intern(name)
             url = self._build_moegirl_page_url(name)
             if url in seen:
                 continue
@@ -644,10 +1146,16 @@ class CrawlerService:
             text = text[: self.MAX_LLM_CHARS].rstrip() + "\n\n[Content truncated]"
         return text
 
-    def _format_generic_llm_content(self, parsed_data: Dict[str, Any], soup: BeautifulSoup) -> str:
+    def _format_generic_llm_content(
+        self,
+        parsed_data: Dict[str, Any],
+        tree: lxml_html.HtmlElement,
+        raw_text: Optional[str] = None,
+    ) -> str:
         """
         Generic LLM content formatting for non-Moegirl sites (Fandom/Wikipedia/etc.).
         Keep the input compact and structured to reduce noise.
+        raw_text is the caller's _extract_text_from_tree result, if it already has one.
         """
         title = str(parsed_data.get("title") or "").strip()
         summary = str(parsed_data.get("summary") or "").strip()
@@ -732,8 +1240,8 @@ class CrawlerService:
                 parts.append("Tables:\n" + "\n\n".join(table_blocks))
 
         excerpt = []
-        for p in soup.find_all("p")[:60]:
-            text = p.get_text(" ", strip=True)
+        for p in islice(tree.iter("p"), 60):
+            text = _node_text(p)
             if len(text) >= 40:
                 excerpt.append(text)
             if len(excerpt) >= 12:
@@ -741,10 +1249,11 @@ class CrawlerService:
         if excerpt:
             parts.append("Excerpt:\n" + "\n".join(excerpt))
 
-        raw_text = self._extract_text_from_soup(soup)
+        if raw_text is None:
+            raw_text = self._extract_text_from_tree(tree)
         if raw_text:
             # Avoid Chinese intro marker in generic sources; keep it neutral for English prompts.
-            raw_text = re.sub(r"(?m)^##\s*简介\s*\n", "## Intro\n", raw_text)
+            raw_text = _INTRO_HEADING_RE.sub("## Intro\n", raw_text)
             parts.append("RawText:\n" + raw_text[:12000].strip())
 
         text = "\n\n".join([p for p in parts if p]).strip()
@@ -753,32 +1262,16 @@ class CrawlerService:
         return text
 
     def _extract_mediawiki_title(self, parsed) -> Optional[str]:
-        if "index.php" in parsed.path:
-            query_params = parse_qs(parsed.query)
-            title = query_params.get("title", [None])[0]
-            return unquote(title) if title else None
-
-        path_parts = parsed.path.strip("/").split("/")
-        if not path_parts:
-            return None
-        if path_parts[0] == "wiki" and len(path_parts) > 1:
-            return unquote("/".join(path_parts[1:]))
-        if path_parts[0] != "index.php":
-            return unquote(parsed.path.strip("/"))
-        return None
+        return _mediawiki_title_of(parsed.path, parsed.query)
 
     def _get_mediawiki_api_url(self, parsed) -> str:
-        path_parts = parsed.path.strip("/").split("/")
-        lang_prefix = ""
-        if len(path_parts) > 0 and len(path_parts[0]) == 2 and path_parts[0] != "wiki":
-            lang_prefix = f"/{path_parts[0]}"
-        return f"{parsed.scheme}://{parsed.netloc}{lang_prefix}/api.php"
+        return _mediawiki_api_url_of(parsed.scheme, parsed.netloc, parsed.path)
 
     def _scrape_mediawiki_parse(self, url: str, parsed) -> Dict[str, Any]:
         """Generic MediaWiki parse-action scraper (Fandom/Moegirl/Huiji/etc.)"""
         article_name = self._extract_mediawiki_title(parsed)
         if not article_name:
-            return self._scrape_html(url)
+            return self._scrape_html(url, parsed)
 
         api_url = self._get_mediawiki_api_url(parsed)
         params = {
@@ -786,36 +1279,38 @@ class CrawlerService:
             "page": article_name,
             "prop": "text|categories",
             "format": "json",
+            # Raw UTF-8 instead of \uXXXX escapes: CJK article HTML is about half the size to
+            # transfer and decode (formatversion=2 requests already imply this).
+            "utf8": "1",
             "redirects": "1",
         }
 
         try:
             response = self.session.get(api_url, params=params, timeout=15)
             response.raise_for_status()
-            response.encoding = "utf-8"
-            data = response.json()
+            data = _response_json(response)
 
             if "error" in data:
-                return self._scrape_html(url)
+                return self._scrape_html(url, parsed)
 
             parse_data = data.get("parse", {})
             title = parse_data.get("title", "Untitled")
             html_content = parse_data.get("text", {}).get("*", "")
 
             if not html_content:
-                return self._scrape_html(url)
+                return self._scrape_html(url, parsed)
 
             return self._build_from_html(html_content, title, url)
 
         except Exception as exc:
             logger.error("MediaWiki parse error: %s", exc)
-            return self._scrape_html(url)
+            return self._scrape_html(url, parsed)
 
     def _scrape_wikipedia(self, url: str, parsed) -> Dict[str, Any]:
         """Scrape Wikipedia using REST API and mobile HTML."""
         path_parts = parsed.path.strip("/").split("/")
         if len(path_parts) < 2 or path_parts[0] != "wiki":
-            return self._scrape_html(url)
+            return self._scrape_html(url, parsed)
 
         article_name = "/".join(path_parts[1:])
 
@@ -825,44 +1320,21 @@ class CrawlerService:
             content_resp.raise_for_status()
             html = content_resp.text
 
-            title = ""
-            try:
-                soup_preview = BeautifulSoup(html[:5000], "lxml")
-                title_tag = soup_preview.find("title")
-                if title_tag:
-                    title = title_tag.get_text(strip=True).split(" - ")[0]
-            except Exception as exc:
-                logger.warning("Failed to extract title: %s", exc)
+            title = _sniff_title(html)
 
             return self._build_from_html(html, title or article_name, url)
         except Exception:
-            return self._scrape_html(url)
+            return self._scrape_html(url, parsed)
 
-    def _scrape_html(self, url: str) -> Dict[str, Any]:
+    def _scrape_html(self, url: str, parsed) -> Dict[str, Any]:
         """Fallback HTML scraping method"""
         try:
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
 
-            if response.encoding and response.encoding.lower() in ["iso-8859-1", "ascii"]:
-                detected = response.apparent_encoding
-                response.encoding = detected if detected else "utf-8"
-            elif not response.encoding:
-                response.encoding = "utf-8"
-
-            parsed_check = urlparse(url)
-            if any(x in parsed_check.netloc for x in ["moegirl", "baike", "hudong", "zh."]):
-                response.encoding = "utf-8"
-
-            html = response.text
-            title = ""
-            try:
-                soup_preview = BeautifulSoup(html[:5000], "lxml")
-                title_tag = soup_preview.find("title")
-                if title_tag:
-                    title = title_tag.get_text(strip=True).split(" - ")[0]
-            except Exception as exc:
-                logger.warning("Failed to extract title: %s", exc)
+            force_utf8 = _is_utf8_host(parsed.netloc)
+            html = _decode_html(response.content, response.encoding, force_utf8)
+            title = _sniff_title(html)
 
             return self._build_from_html(html, title, url)
 
@@ -877,8 +1349,19 @@ class CrawlerService:
             }
 
     def _build_from_html(self, html: str, title: str, url: str) -> Dict[str, Any]:
-        soup = BeautifulSoup(html, "lxml")
-        parsed_data = wiki_parser.parse_page(html, title=title or "Untitled")
+        # The structured parser works on bs4; the text/link helpers below share one lxml
+        # tree, parsed once. Contract: _extract_text_from_tree runs exactly once and
+        # before _extract_links, because it drops nav/footer/noise-class nodes in place
+        # and the link pass is meant to see that pruned tree.
+        tree = _parse_html_tree(html)
+        # On MediaWiki pages only the article container is handed to bs4: the skin chrome
+        # around it (head, sidebars, footer) is most of the markup and carries no article data.
+        article = _first(tree, _MW_OUTPUT_XPATH)
+        if article is not None:
+            html_for_parser = lxml_html.tostring(article, encoding="unicode", with_tail=False)
+        else:
+            html_for_parser = html
+        parsed_data = wiki_parser.parse_page_soup(BeautifulSoup(html_for_parser, "lxml"), title=title or "Untitled")
 
         has_structure = any(
             [
@@ -889,8 +1372,9 @@ class CrawlerService:
             ]
         )
 
+        fallback_text = None
         if not has_structure:
-            fallback_text = self._extract_text_from_soup(soup)
+            fallback_text = self._extract_text_from_tree(tree)
             parsed_data = {
                 "title": title or "Untitled",
                 "summary": fallback_text[:800],
@@ -901,27 +1385,36 @@ class CrawlerService:
 
         lowered_url = str(url or "").lower()
         if any(x in lowered_url for x in ["fandom.com", "wikipedia.org"]):
-            llm_content = self._format_generic_llm_content(parsed_data, soup)
+            llm_content = self._format_generic_llm_content(parsed_data, tree, fallback_text)
         else:
-            llm_content = wiki_parser.format_for_llm(parsed_data, max_chars=self.MAX_LLM_CHARS)
-            # 追加更多正文段落，尽可能还原页面信息
-            extra_paragraphs = []
-            for p in soup.find_all("p")[:80]:
-                text = p.get_text(" ", strip=True)
-                if len(text) >= 20:
-                    extra_paragraphs.append(text)
-            if extra_paragraphs:
-                llm_content = f"{llm_content}\n\n" + "\n".join(extra_paragraphs)
-
-            # 再追加纯文本兜底，确保长内容传递给 LLM
-            fallback_text = self._extract_text_from_soup(soup)
-            if fallback_text:
-                llm_content = f"{llm_content}\n\n{fallback_text[:20000]}"
+            structured_llm = wiki_parser.format_for_llm(parsed_data, max_chars=self.MAX_LLM_CHARS)
+            llm_parts = [structured_llm]
+            # A structured body that already fills half the budget would only be diluted
+            # by the page-wide paragraphs and text below.
+            if not (has_structure and len(structured_llm) >= self.MAX_LLM_CHARS // 2):
+                # 追加更多正文段落，尽可能还原页面信息
+                extra_paragraphs = []
+                for p in islice(tree.iter("p"), 80):
+                    text = _node_text(p)
+                    if len(text) >= 20:
+                        extra_paragraphs.append(text)
+                if extra_paragraphs:
+                    llm_parts.append("\n".join(extra_paragraphs))
+
+                # 再追加纯文本兜底，确保长内容传递给 LLM
+                if fallback_text is None:
+                    fallback_text = self._extract_text_from_tree(tree)
+                if fallback_text:
+                    llm_parts.append(fallback_text[:20000])
+            elif fallback_text is None:
+                # The text pass also prunes noise nodes that the link pass below relies on.
+                self._extract_text_from_tree(tree)
+            llm_content = "\n\n".join(llm_parts)[: self.MAX_LLM_CHARS]
         preview_content = wiki_parser.format_for_preview(parsed_data, max_chars=self.MAX_PREVIEW_CHARS)
         if not preview_content:
             preview_content = llm_content[: self.MAX_PREVIEW_CHARS]
 
-        links = self._extract_links(soup, url)
+        links = self._extract_links(tree, url)
         is_list_page = len(links) > 10
 
         return {
@@ -934,126 +1427,162 @@ class CrawlerService:
             "url": url,
         }
 
-    def _extract_text_from_soup(self, soup: BeautifulSoup) -> str:
-        """Extract main text content from soup with smart list/table handling"""
-        content_selectors = [
-            ("div", {"class": "mw-parser-output"}),
-            ("div", {"id": "mw-content-text"}),
-            ("div", {"class": "page-content"}),
-            ("article", {}),
-            ("main", {}),
-        ]
-
+    def _extract_text_from_tree(self, tree: lxml_html.HtmlElement) -> str:
+        """
+        Extract main text content from the tree with smart list/table handling.
+        Mutates the tree: nav/aside/footer/noscript (and, on non-list pages, noise-class
+        elements) are dropped in place so _extract_links can reuse the pruned tree.
+        """
         content = None
-        for tag, attrs in content_selectors:
-            content = soup.find(tag, attrs) if attrs else soup.find(tag)
-            if content:
+        for xpath in _CONTENT_XPATHS:
+            content = _first(tree, xpath)
+            if content is not None:
                 break
 
-        if not content:
-            content = soup.find("body")
-
-        if not content:
+        if content is None:
             return ""
 
-        tables = content.find_all("table")
-        lists = content.find_all(["ul", "ol"])
+        tables = _TABLES_XPATH(content)
+        lists = _LISTS_XPATH(content)
         is_list_heavy = len(tables) > 2 or len(lists) > 3
 
-        for unwanted in content.find_all(["nav", "aside", "footer", "script", "style", "noscript"]):
-            unwanted.decompose()
+        for unwanted in _TEXT_CHROME_XPATH(content):
+            _drop_node(unwanted)
 
         if not is_list_heavy:
-            for cls in ["navbox", "toc", "sidebar", "infobox", "navigation", "mw-editsection", "reference"]:
-                for elem in content.find_all(class_=re.compile(cls, re.I)):
-                    elem.decompose()
+            for elem in [e for e in _CLASSED_XPATH(content) if _UNWANTED_CLASS_RE.search(e.get("class"))]:
+                _drop_node(elem)
 
+        # The intro paragraph and the section text come from one walk over the pruned
+        # tree: the first <p> among the block tags is the document's first <p>.
+        blocks = list(content.iterdescendants(*_TEXT_BLOCK_TAGS))
         text_parts = []
-        first_p = content.find("p")
-        if first_p:
-            intro = first_p.get_text(" ", strip=True)
+        first_p = next((elem for elem in blocks if elem.tag == "p"), None)
+        if first_p is not None:
+            intro = _node_text(first_p)
             if intro and len(intro) > 20:
                 text_parts.append(f"## 简介\n{intro}\n")
 
-        for elem in content.find_all(["h1", "h2", "h3", "h4", "p", "li"]):
-            text = elem.get_text(" ", strip=True)
+        for elem in blocks:
+            text = _node_text(elem)
             if not text or len(text) < 3:
                 continue
 
-            if elem.name in ["h1", "h2"]:
+            if elem.tag in ["h1", "h2"]:
                 text_parts.append(f"\n## {text}\n")
-            elif elem.name in ["h3", "h4"]:
+            elif elem.tag in ["h3", "h4"]:
                 text_parts.append(f"\n### {text}\n")
             else:
                 text_parts.append(text)
 
         if len(text_parts) < 5 and tables:
+            # Tables dropped above as noise no longer hang off the content root.
+            live_tables = set(content.iter("table"))
             for table in tables[:3]:
-                rows = table.find_all("tr")
+                if table not in live_tables:
+                    continue
+                rows = table.xpath(".//tr")
                 for row in rows[:10]:
-                    cells = row.find_all(["td", "th"])
-                    row_text = " | ".join([c.get_text(" ", strip=True) for c in cells if c.get_text(" ", strip=True)])
+                    cells = row.xpath(".//td|.//th")
+                    row_text = " | ".join([text for text in (_node_text(c) for c in cells) if text])
                     if row_text:
                         text_parts.append(row_text)
 
         result = "\n\n".join(text_parts)
         if not result or len(result) < 50:
-            result = content.get_text(separator="\n", strip=True)[:1000]
+            result = _node_text(content, "\n")[:1000]
 
         return result
 
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
-        """Extract internal links with enhanced table/category support"""
-        base_domain = urlparse(base_url).netloc
+    def _extract_links(self, tree: lxml_html.HtmlElement, base_url: str) -> List[Dict[str, str]]:
+        """
+        Extract internal links with enhanced table/category support.
+        Expects a tree already pruned by _extract_text_from_tree, so navigation and
+        navbox links are gone.
+        """
+        base_parsed = urlparse(base_url)
+        base_domain = base_parsed.netloc
+        # Same-site URLs start with "<scheme>://<netloc>" followed by a path/query
+        # delimiter; anything else falls back to a full urlparse.
+        base_prefix = f"{base_parsed.scheme}://{base_domain}"
+        prefix_len = len(base_prefix)
         links: List[Dict[str, str]] = []
         seen_urls = set()
 
-        content = soup.find("div", class_="mw-parser-output") or soup.find("body")
-        if not content:
+        content = _first(tree, _MW_OUTPUT_XPATH)
+        if content is None:
+            content = _first(tree, ".//body")
+        if content is None:
             return []
 
-        def add_link(href: str, link_text: str) -> None:
+        # Raw href -> absolute URL, or None when the href is off-site/namespaced. List
+        # pages repeat the same hrefs many times; resolve each distinct one once.
+        resolved_hrefs: Dict[str, Optional[str]] = {}
+
+        def resolve(href: str) -> Optional[str]:
             full_url = urljoin(base_url, href)
             full_url, _ = urldefrag(full_url)
-            full_domain = urlparse(full_url).netloc
+            if full_url.startswith(base_prefix) and full_url[prefix_len:prefix_len + 1] in ("", "/", "?"):
+                full_domain = base_domain
+            else:
+                full_domain = urlparse(full_url).netloc
             if full_domain != base_domain:
                 # 萌娘百科在移动/桌面/分站之间可能混用域名：mzh / zh / www
                 if "moegirl.org" in (base_domain or "") and "moegirl.org" in (full_domain or ""):
                     pass
                 else:
-                    return
-            if any(x in href.lower() for x in ["special:", "file:", "talk:", "template:", "user:"]):
+                    return None
+            if _SKIP_LINK_RE.search(href):
+                return None
+            return full_url
+
+        def add_link(a_tag: lxml_html.HtmlElement) -> None:
+            href = a_tag.get("href")
+            if href in resolved_hrefs:
+                full_url = resolved_hrefs[href]
+            else:
+                full_url = resolved_hrefs[href] = resolve(href)
+            if full_url is None or full_url in seen_urls:
                 return
+            link_text = _node_text(a_tag, "")
             if not link_text or len(link_text) < 2:
                 return
-            if full_url not in seen_urls:
-                seen_urls.add(full_url)
-                links.append({"title": link_text, "url": full_url})
-
-        tables = content.find_all("table")
-        for table in tables[:20]:
-            for a_tag in table.find_all("a", href=True):
-                add_link(a_tag["href"], a_tag.get_text(strip=True))
-                if len(links) >= self.MAX_LINKS:
+            seen_urls.add(full_url)
+            links.append({"title": link_text, "url": full_url})
+
+        # Priority: anchors inside the first 20 tables, then inside the first 20 lists,
+        # then everything else; document order within each group. One walk over the
+        # anchors, bucketed by their nearest prioritized container. Table anchors are
+        # added as the walk reaches them, so a page whose tables alone fill MAX_LINKS
+        # stops the walk there.
+        priority_tables = set(_TABLES_XPATH(content)[:20])
+        priority_lists = set(_LISTS_XPATH(content)[:20])
+        in_lists: List[lxml_html.HtmlElement] = []
+        rest: List[lxml_html.HtmlElement] = []
+        for a_tag in content.iter("a"):
+            if a_tag.get("href") is None:
+                continue
+            bucket = rest
+            for ancestor in a_tag.iterancestors():
+                if ancestor in priority_tables:
+                    bucket = None
                     break
-            if len(links) >= self.MAX_LINKS:
-                break
-
-        if len(links) < self.MAX_LINKS:
-            lists = content.find_all(["ul", "ol"])
-            for lst in lists[:20]:
-                for a_tag in lst.find_all("a", href=True):
-                    add_link(a_tag["href"], a_tag.get_text(strip=True))
-                    if len(links) >= self.MAX_LINKS:
-                        break
-                if len(links) >= self.MAX_LINKS:
+                if ancestor in priority_lists:
+                    bucket = in_lists
+                if ancestor is content:
                     break
+            if bucket is None:
+                add_link(a_tag)
+                if len(links) >= self.MAX_LINKS:
+                    return links
+            else:
+                bucket.append(a_tag)
 
-        if len(links) < self.MAX_LINKS:
-            for a_tag in content.find_all("a", href=True):
-                add_link(a_tag["href"], a_tag.get_text(strip=True))
+        for bucket in (in_lists, rest):
+            for a_tag in bucket:
+                add_link(a_tag)
                 if len(links) >= self.MAX_LINKS:
-                    break
+                    return links
 
         return links
 
@@ -1062,106 +1591,200 @@ class CrawlerService:
         if not content:
             return ""
 
-        content = re.sub(r"\n{3,}", "\n\n", content)
-        content = re.sub(r" {2,}", " ", content)
+        # A substring probe is a C-speed scan; the regexes only run when there is a run
+        # to collapse (extracted text rarely has double spaces at all).
+        if "\n\n\n" in content:
+            content = _MULTI_NEWLINE_RE.sub("\n\n", content)
+        if "  " in content:
+            content = _MULTI_SPACE_RE.sub(" ", content)
         return content.strip()
 
-    async def scrape_pages_concurrent(self, urls: List[str], concurrency: int = 6) -> List[Dict[str, Any]]:
+    def _uses_api_scraper(self, url: str) -> bool:
+        """Whether scrape_page routes this URL to a MediaWiki/REST API scraper."""
+        return self._domain_handler(urlparse(url).netloc) is not None
+
+    def _get_aio_session(self, concurrency: int) -> aiohttp.ClientSession:
+        if self._aio_session is None or self._aio_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=concurrency,
+                limit_per_host=concurrency,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self._aio_session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self._aio_session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.BLOCKING_WORKERS, thread_name_prefix="crawler")
+        return self._executor
+
+    async def _run_blocking(self, func, *args):
+        """在爬虫线程池中执行阻塞调用 / Run a blocking call on the crawler thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._parse_pool
+
+    async def _build_from_html_async(self, html: str, title: str, url: str) -> Dict[str, Any]:
         """
-        Scrape multiple pages concurrently using thread pool executor.
-        Returns a list of structured data compatible with extraction.
+        在事件循环外解析页面 / Run _build_from_html off the event loop.
+
+        Parsing is CPU-bound: large pages go to a process pool so concurrent scrapes
+        are not serialized on the GIL; smaller ones are not worth the pickling round
+        trip and use the crawler thread pool.
+        """
+        if len(html) >= self.PROCESS_PARSE_MIN_CHARS:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._get_parse_pool(), _build_from_html_worker, html, title, url)
+            except BrokenProcessPool as exc:
+                logger.warning("Parse pool unavailable, parsing in a thread: %s", exc)
+                self._parse_pool = None
+        return await self._run_blocking(self._build_from_html, html, title, url)
+
+    async def aclose(self) -> None:
+        """Close the shared aiohttp session and worker pools / 关闭共享的 aiohttp 会话与工作池"""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def scrape_page_async(self, url: str) -> Dict[str, Any]:
         """
-        import concurrent.futures
+        异步爬取单个页面 / Awaitable scrape_page for request handlers.
 
-        loop = asyncio.get_event_loop()
+        The scrapers use blocking HTTP, so the work runs on the crawler thread pool
+        instead of stalling the event loop; cache hits return without a thread hop.
+        """
+        cached = self._get_cached_scrape(self._scrape_cache_key(url))
+        if cached is not None:
+            return cached
+        return await self._run_blocking(self.scrape_page, url)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
-            futures = [loop.run_in_executor(executor, self._scrape_for_batch, url) for url in urls]
-            results = await asyncio.gather(*futures)
+    async def scrape_pages_concurrent(self, urls: List[str], concurrency: int = 6) -> List[Dict[str, Any]]:
+        """
+        Scrape multiple pages concurrently.
 
-        return list(results)
+        Plain HTML pages are fetched on one shared aiohttp session; pages that need the
+        MediaWiki/REST API scrapers run scrape_page on the crawler thread pool. Both
+        paths share one semaphore. Returns a list of structured data compatible with
+        extraction.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        session = self._get_aio_session(concurrency)
+
+        async def scrape_via_api(url: str) -> Dict[str, Any]:
+            cached = self._get_cached_scrape(self._scrape_cache_key(url))
+            if cached is not None:
+                return self._batch_result(url, cached)
+            async with semaphore:
+                return await self._run_blocking(self._scrape_for_batch, url)
+
+        tasks = [
+            scrape_via_api(url) if self._uses_api_scraper(url) else self._scrape_single_async(session, url, semaphore)
+            for url in urls
+        ]
+        return list(await asyncio.gather(*tasks))
 
     def _scrape_for_batch(self, url: str) -> Dict[str, Any]:
         """Wrapper around scrape_page that formats result for batch extraction"""
         try:
-            result = self.scrape_page(url)
-            return {
-                "success": result.get("success", False),
-                "url": url,
-                "title": result.get("title", ""),
-                "content": result.get("content", ""),
-                "llm_content": result.get("llm_content", ""),
-                "error": result.get("error"),
-            }
+            return self._batch_result(url, self.scrape_page(url))
         except Exception as exc:
             return {"success": False, "url": url, "error": str(exc)}
 
+    def _batch_result(self, url: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "success": result.get("success", False),
+            "url": url,
+            "title": result.get("title", ""),
+            "content": result.get("content", ""),
+            "llm_content": result.get("llm_content", ""),
+            "error": result.get("error"),
+        }
+
+    async def _fetch_html_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Tuple[int, bytes, Optional[str], bool]:
+        """
+        异步读取页面 / Fetch a page for the batch path.
+
+        Returns (status, body, header charset as requests reports it, truncated); the
+        body is only read for a 200. Connection errors and timeouts propagate.
+        """
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with session.get(url, timeout=timeout) as response:
+            if response.status != 200:
+                return response.status, b"", None, False
+
+            # Stream with a size cap so a runaway page cannot pin a worker or memory.
+            chunks: List[bytes] = []
+            received = 0
+            truncated = False
+            async for chunk in response.content.iter_chunked(65536):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= self.MAX_HTML_BYTES:
+                    logger.warning("Truncated %s at %s bytes", url, received)
+                    truncated = True
+                    break
+            # Same charset rules as _scrape_html, fed the header charset the way requests
+            # reports it, so both paths produce the same text.
+            return response.status, b"".join(chunks), get_encoding_from_headers(response.headers), truncated
+
     async def _scrape_single_async(self, session: aiohttp.ClientSession, url: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
-        """Async scrape a single page and use WikiStructuredParser"""
+        """Async fetch of a plain HTML page; decoding, parsing and caching match scrape_page."""
+        cache_key = self._scrape_cache_key(url)
+        cached = self._get_cached_scrape(cache_key)
+        if cached is not None:
+            return self._batch_result(url, cached)
+
         async with semaphore:
             try:
-                headers = {"User-Agent": self.headers["User-Agent"]}
                 parsed = urlparse(url)
-                force_utf8 = any(x in parsed.netloc for x in ["moegirl", "baike", "zh."])
-
-                timeout = aiohttp.ClientTimeout(total=30)
-                async with session.get(url, headers=headers, timeout=timeout) as response:
-                    if response.status != 200:
-                        logger.warning("HTTP %s for %s", response.status, url)
-                        return {"success": False, "url": url, "error": f"Status {response.status}"}
-
-                    content_bytes = await response.read()
-
-                    if force_utf8:
-                        html = content_bytes.decode("utf-8", errors="replace")
-                    else:
-                        encoding = response.get_encoding() or "utf-8"
-                        try:
-                            html = content_bytes.decode(encoding, errors="replace")
-                        except (UnicodeDecodeError, LookupError) as exc:
-                            logger.warning("Failed to decode with %s: %s", encoding, exc)
-                            html = content_bytes.decode("utf-8", errors="replace")
-
-                    title = ""
-                    try:
-                        soup_preview = BeautifulSoup(html[:5000], "lxml")
-                        title_tag = soup_preview.find("title")
-                        if title_tag:
-                            title = title_tag.get_text(strip=True).split(" - ")[0]
-                    except Exception as exc:
-                        logger.warning("Failed to extract title: %s", exc)
-
-                    parsed_data = wiki_parser.parse_page(html, title=title or url.split("/")[-1])
-                    parsed_data["url"] = url
-                    parsed_data["success"] = True
-
-                    if not any(
-                        [
-                            parsed_data.get("infobox"),
-                            parsed_data.get("sections"),
-                            parsed_data.get("summary"),
-                            parsed_data.get("tables"),
-                        ]
-                    ):
-                        soup = BeautifulSoup(html, "lxml")
-                        content_div = soup.find("div", class_="mw-parser-output") or soup.find("body")
-                        if content_div:
-                            raw_paragraphs = []
-                            for p in content_div.find_all("p")[:5]:
-                                text = p.get_text(" ", strip=True)
-                                if len(text) > 20:
-                                    raw_paragraphs.append(text)
-
-                            if raw_paragraphs:
-                                parsed_data["summary"] = "\n".join(raw_paragraphs[:2])
-                                parsed_data["sections"] = {"background": "\n".join(raw_paragraphs)}
-
-                    parsed_data["llm_content"] = wiki_parser.format_for_llm(parsed_data, max_chars=self.MAX_LLM_CHARS)
-                    return parsed_data
+                force_utf8 = _is_utf8_host(parsed.netloc)
+
+                try:
+                    status, content_bytes, declared, truncated = await self._fetch_html_async(session, url)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    status, failure = None, exc
+                else:
+                    failure = f"HTTP {status}"
+                if status is None or status in _RETRY_STATUSES:
+                    # Connection errors, timeouts and transient statuses get the sync
+                    # session's Retry policy instead of failing the batch entry outright.
+                    logger.warning("Async fetch failed for %s (%s); retrying via scrape_page", url, failure)
+                    return self._batch_result(url, await self._run_blocking(self.scrape_page, url))
+                if status != 200:
+                    logger.warning("HTTP %s for %s", status, url)
+                    return {"success": False, "url": url, "error": f"Status {status}"}
+
+                html = _decode_html(content_bytes, declared, force_utf8)
+                title = _sniff_title(html)
+
+                result = self._finalize_scrape(await self._build_from_html_async(html, title, url))
+                # A truncated page is not what scrape_page would return; keep it out of the
+                # cache that scrape_page and the preview endpoint read.
+                if not truncated:
+                    self._store_scrape(cache_key, result)
+                return self._batch_result(url, result)
 
             except Exception as exc:
                 logger.error("Concurrent scraper failed %s: %s", url, exc)
                 return {"success": False, "url": url, "error": str(exc)}
 
 
+def _build_from_html_worker(html: str, title: str, url: str) -> Dict[str, Any]:
+    """进程池入口 / Process-pool entry point; module-level so it pickles by reference."""
+    return crawler_service._build_from_html(html, title, url)
+
+
 crawler_service = CrawlerService()
@@ -11,15 +11,124 @@ License: PolyForm Noncommercial License 1.0.0
   Search service for fanfiction import - Moegirlpedia OpenSearch wrapper providing stable, unified search results for wiki article discovery.
 """
 
-from typing import List, Dict
-from urllib.parse import parse_qs, quote, unquote, urlparse
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlparse, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from app.utils.logger import get_logger
 
+# orjson 为可选依赖，缺失时回退到标准库 / orjson is optional; fall back to stdlib json
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
 logger = get_logger(__name__)
 
 
+def _build_http_session() -> requests.Session:
+    """
+    构建共享的搜索 HTTP 会话 / Build the shared keep-alive session for search APIs.
+
+    Searches are interactive, so retries stay short: at most two, with a brief backoff.
+    """
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _response_json(resp: requests.Response):
+    """
+    解析搜索 API 响应 / Decode a search API JSON response.
+
+    JSON over HTTP is UTF-8, so the raw bytes go straight to orjson instead of through
+    requests' charset guessing; the stdlib parses anything orjson rejects.
+    """
+    if _orjson_available:
+        try:
+            return orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(resp.content.decode("utf-8", errors="replace"))
+
+
+def _result_key(url: str) -> Tuple[str, str, str]:
+    """
+    结果去重键 / Dedup key for merged search results.
+
+    Case-insensitive like before, but the scheme, a trailing slash and the
+    mzh./zh. mirror prefix no longer make the same article look distinct.
+    """
+    parts = urlsplit(url.lower())
+    host = parts.netloc
+    if host.startswith("mzh."):
+        host = host[1:]
+    return host, parts.path.rstrip("/"), parts.query
+
+
+@lru_cache(maxsize=4096)
+def _moegirl_canonical_url(raw: str) -> str:
+    """
+    萌娘百科规范 URL（按原始 URL 缓存）/ Canonical Moegirl URL, memoized per raw URL.
+
+    Search hits for popular titles recur across queries, so the urlparse/parse_qs
+    work is done once per distinct URL. See SearchService._normalize_moegirl_url.
+    """
+    try:
+        parsed = urlparse(raw)
+    except Exception:
+        return raw
+
+    host = (parsed.netloc or "").lower()
+    if "moegirl.org" not in host:
+        return raw
+
+    query = parse_qs(parsed.query or "")
+    title = query.get("title", [None])[0]
+    if title:
+        title = unquote(str(title)).strip()
+    else:
+        path = (parsed.path or "").strip("/")
+        if path.startswith("wiki/"):
+            path = path[len("wiki/") :]
+        if path and path not in {"index.php", "api.php"}:
+            title = unquote(path).strip()
+
+    if not title:
+        return raw
+
+    safe = quote(str(title).replace(" ", "_"), safe="")
+    return f"https://mzh.moegirl.org.cn/index.php?title={safe}"
+
+
+# CJK Unified Ideographs; one C-level scan that stops at the first match.
+_CJK_RE = re.compile("[\u4e00-\u9fff]")
+# Shared by every SearchService instance so repeat searches reuse open connections.
+_http_session = _build_http_session()
+# Runs the per-engine requests of a merged search side by side; threads start on demand.
+_search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search")
+
+
 class SearchService:
     """
     萌娘百科搜索服务包装 - 专用于同人创作导入的搜索。
@@ -30,7 +139,12 @@ class SearchService:
 
     Attributes:
         moegirl_opensearch_api: 萌娘百科搜索 API URL / Moegirlpedia OpenSearch API endpoint
+        RESULT_CACHE_SIZE: 搜索结果缓存条目上限 (Max cached searches)
+        RESULT_CACHE_TTL_SECONDS: 搜索结果缓存有效期 (Search result cache TTL)
     """
+
+    RESULT_CACHE_SIZE = 256
+    RESULT_CACHE_TTL_SECONDS = 600
     
     def __init__(self):
         self.moegirl_opensearch_api = "https://mzh.moegirl.org.cn/api.php"
@@ -43,19 +157,44 @@ class SearchService:
                 "Chrome/120.0.0.0 Safari/537.36"
             )
         }
+        self.session = _http_session
+        self._result_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, List[Dict[str, str]]]]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+
+    def _get_cached_results(self, cache_key: Tuple[str, str, int]) -> Optional[List[Dict[str, str]]]:
+        with self._result_cache_lock:
+            entry = self._result_cache.get(cache_key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.RESULT_CACHE_TTL_SECONDS:
+                del self._result_cache[cache_key]
+                return None
+            self._result_cache.move_to_end(cache_key)
+            return [dict(item) for item in entry[1]]
+
+    def _store_results(self, cache_key: Tuple[str, str, int], results: List[Dict[str, str]]) -> None:
+        # Engines return [] on API errors, so empty results are not cached.
+        if not results:
+            return
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = (time.monotonic(), [dict(item) for item in results])
+            self._result_cache.move_to_end(cache_key)
+            while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """清空搜索结果缓存 / Drop all cached search results."""
+        with self._result_cache_lock:
+            self._result_cache.clear()
 
     def _safe_limit(self, max_results: int) -> int:
         return max(1, min(int(max_results or 10), 20))
 
     def _looks_cjk(self, text: str) -> bool:
-        body = str(text or "").strip()
-        if not body:
-            return False
-        return any(0x4E00 <= ord(ch) <= 0x9FFF for ch in body)
+        return _CJK_RE.search(str(text or "")) is not None
 
     def _merge_results(self, groups: List[List[Dict[str, str]]], limit: int) -> List[Dict[str, str]]:
-        merged: List[Dict[str, str]] = []
-        seen = set()
+        merged: Dict[Tuple[str, str, str], Dict[str, str]] = {}
         for group in groups or []:
             for item in group or []:
                 if not isinstance(item, dict):
@@ -64,14 +203,10 @@ class SearchService:
                 title = str(item.get("title") or "").strip()
                 if not url or not title:
                     continue
-                key = url.lower()
-                if key in seen:
-                    continue
-                seen.add(key)
-                merged.append(item)
+                merged.setdefault(_result_key(url), item)
                 if len(merged) >= limit:
-                    return merged
-        return merged
+                    return list(merged.values())
+        return list(merged.values())
 
     def _normalize_moegirl_url(self, url: str) -> str:
         """
@@ -88,32 +223,7 @@ class SearchService:
         raw = str(url or "").strip()
         if not raw:
             return ""
-
-        try:
-            parsed = urlparse(raw)
-        except Exception:
-            return raw
-
-        host = (parsed.netloc or "").lower()
-        if "moegirl.org" not in host:
-            return raw
-
-        query = parse_qs(parsed.query or "")
-        title = query.get("title", [None])[0]
-        if title:
-            title = unquote(str(title)).strip()
-        else:
-            path = (parsed.path or "").strip("/")
-            if path.startswith("wiki/"):
-                path = path[len("wiki/") :]
-            if path and path not in {"index.php", "api.php"}:
-                title = unquote(path).strip()
-
-        if not title:
-            return raw
-
-        safe = quote(str(title).replace(" ", "_"), safe="")
-        return f"https://mzh.moegirl.org.cn/index.php?title={safe}"
+        return _moegirl_canonical_url(raw)
 
     def _search_moegirl(self, query: str, limit: int) -> List[Dict[str, str]]:
         """
@@ -131,7 +241,7 @@ class SearchService:
             return []
 
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 self.moegirl_opensearch_api,
                 params={
                     "action": "opensearch",
@@ -143,7 +253,7 @@ class SearchService:
                 timeout=(3, 10),
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = _response_json(resp)
         except Exception as exc:
             logger.error("Moegirl API error query=%s err=%s", q, exc)
             return []
@@ -179,7 +289,7 @@ class SearchService:
             return []
 
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 self.wikipedia_opensearch_api,
                 params={
                     "action": "opensearch",
@@ -191,7 +301,7 @@ class SearchService:
                 timeout=(3, 10),
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = _response_json(resp)
         except Exception as exc:
             logger.error("Wikipedia API error query=%s err=%s", q, exc)
             return []
@@ -228,14 +338,14 @@ class SearchService:
             return []
 
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 self.fandom_search_api,
                 params={"query": q, "limit": limit, "ns": 0},
                 headers=self._headers,
                 timeout=(3, 12),
             )
             resp.raise_for_status()
-            data = resp.json() or {}
+            data = _response_json(resp) or {}
         except Exception as exc:
             logger.error("Fandom API error query=%s err=%s", q, exc)
             return []
@@ -260,18 +370,29 @@ class SearchService:
     def search_wiki(self, query: str, max_results: int = 10, engine: str = "moegirl") -> List[Dict[str, str]]:
         """
         Search wiki pages across supported engines: moegirl, wikipedia, fandom.
+        Non-empty results are cached per (engine, query, limit) for a few minutes.
         """
         limit = self._safe_limit(max_results)
         eng = str(engine or "").strip().lower()
+        cache_key = (eng, str(query or "").strip(), limit)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        results = self._search_engine(query, limit, eng)
+        self._store_results(cache_key, results)
+        return results
+
+    def _search_engine(self, query: str, limit: int, eng: str) -> List[Dict[str, str]]:
         if eng in {"auto", "smart"}:
             # Heuristic routing:
             # - If query is CJK-heavy, prefer Moegirl.
             # - Otherwise, merge Fandom + Wikipedia for English queries.
             if self._looks_cjk(query):
                 return self._search_moegirl(query, limit)
-            fandom = self._search_fandom(query, limit)
-            wiki = self._search_wikipedia(query, limit)
-            return self._merge_results([fandom, wiki], limit)
+            # Both engines are queried at once, so latency is the slower call, not the sum.
+            fandom = _search_pool.submit(self._search_fandom, query, limit)
+            wiki = _search_pool.submit(self._search_wikipedia, query, limit)
+            return self._merge_results([fandom.result(), wiki.result()], limit)
         if eng in {"wikipedia", "wiki", "enwiki"}:
             return self._search_wikipedia(query, limit)
         if eng in {"fandom"}:
@@ -12,9 +12,47 @@ License: PolyForm Noncommercial License 1.0.0
 """
 
 import re
+from functools import lru_cache
+from itertools import islice
+
 from bs4 import BeautifulSoup
 from typing import Dict, List
 
+_WS_RE = re.compile(r"\s+")
+# Portable-infobox (Fandom) label/value class fragments, matched per class token by bs4.
+_PI_LABEL_RE = re.compile(r"(pi-data-label|label|name)", re.IGNORECASE)
+_PI_VALUE_RE = re.compile(r"(pi-data-value|value)", re.IGNORECASE)
+# Class fragments of a classic (table) infobox, searched in each class token.
+_INFOBOX_CLASS_RE = re.compile(r"infobox|wikitable|basic-info")
+_TABLE_TAGS = frozenset({"table"})
+_PORTABLE_BOX_TAGS = frozenset({"aside", "div", "section"})
+_PORTABLE_ITEM_TAGS = frozenset({"div", "section"})
+# extract_tables: character-profile keywords keep a table; game-stat keywords drop it
+# unless a profile keyword is also present. One alternation each, scanned in C.
+_TABLE_IDENTITY_RE = re.compile("姓名|本名|别名|身份|职业|性别|生日|身高|体重|所属|阵营|配音|种族")
+_TABLE_SKILL_NOISE_RE = re.compile("攻击|伤害|技能|冷却|等级|效果|倍率|命中|普攻|重击")
+# A paragraph nested in any of these is layout or navigation, not the article summary.
+_SUMMARY_EXCLUDED_PARENTS = frozenset({"table", "li", "ul", "footer"})
+
+
+def _clean_text(value: str) -> str:
+    """Collapse whitespace runs and trim / 压缩空白并去除首尾空白."""
+    text = str(value or "").strip()
+    text = _WS_RE.sub(" ", text).strip()
+    return text
+
+
+def _iter_tags(node, names: frozenset):
+    """
+    按标签名遍历后代元素 / Yield descendant tags whose name is in ``names``, in document order.
+
+    A plain walk over ``descendants`` with Python-side tests: bs4's own find/find_all
+    filter machinery (callables, class_ regexes) costs more per visited node than this.
+    """
+    for tag in node.descendants:
+        if tag.name in names:
+            yield tag
+
 
 class WikiStructuredParser:
     """
@@ -113,28 +151,28 @@ class WikiStructuredParser:
         "identity": ["身份", "职业", "Title", "Identity"],
     }
 
+    # Lowercased once at class creation, in mapping order (the first hit wins), so the
+    # per-row/per-header matchers below only run substring tests.
+    _FIELD_KEYWORDS = tuple(
+        (str(keyword or "").lower(), std_key) for std_key, keywords in FIELD_MAPPING.items() for keyword in keywords
+    )
+    _SECTION_KEYWORDS_LOWER = tuple(
+        (s_type, tuple(str(kw or "").strip().lower() for kw in (keywords or []) if str(kw or "").strip()))
+        for s_type, keywords in SECTION_KEYWORDS.items()
+    )
+
     def _clean_text(self, value: str) -> str:
-        text = str(value or "").strip()
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        return _clean_text(value)
 
     def _map_field_key(self, key_text: str) -> str:
-        key = self._clean_text(key_text)
-        if not key:
-            return ""
-        key_lower = key.lower()
-        for std_key, keywords in self.FIELD_MAPPING.items():
-            for keyword in keywords:
-                if str(keyword or "").lower() in key_lower:
-                    return std_key
-        if 1 < len(key) < 30:
-            return key
-        return ""
+        return _standard_field_key(key_text)
 
     def parse_page(self, html: str, title: str = "") -> Dict:
         """Parse full page into structured data"""
-        soup = BeautifulSoup(html, "lxml")
+        return self.parse_page_soup(BeautifulSoup(html, "lxml"), title=title)
 
+    def parse_page_soup(self, soup: BeautifulSoup, title: str = "") -> Dict:
+        """Parse an already-built soup into structured data (read-only on the tree)"""
         infobox_data = self.extract_infobox(soup)
         sections = self.extract_sections_by_header(soup)
         summary = self.extract_summary(soup)
@@ -165,9 +203,13 @@ class WikiStructuredParser:
             else:
                 data[key] = value[:280]
 
-        infobox = soup.find(
-            "table",
-            class_=lambda c: c and ("infobox" in c or "wikitable" in c or "basic-info" in c),
+        infobox = next(
+            (
+                tag
+                for tag in _iter_tags(soup, _TABLE_TAGS)
+                if any(_INFOBOX_CLASS_RE.search(c) for c in tag.get("class") or ())
+            ),
+            None,
         )
 
         if infobox:
@@ -187,19 +229,23 @@ class WikiStructuredParser:
                     append_field(key_text, val_text)
 
         # Fandom / portable-infobox support
-        portable_boxes = soup.find_all(
-            lambda tag: tag.name in {"aside", "div", "section"}
-            and tag.get("class")
-            and any("portable-infobox" in c for c in tag.get("class"))
+        portable_boxes = islice(
+            (
+                tag
+                for tag in _iter_tags(soup, _PORTABLE_BOX_TAGS)
+                if any("portable-infobox" in c for c in tag.get("class") or ())
+            ),
+            2,
         )
-        for box in portable_boxes[:2]:
-            items = box.find_all(
-                lambda tag: tag.name in {"div", "section"}
-                and (tag.get("data-source") or (tag.get("class") and any("pi-item" in c for c in tag.get("class"))))
-            )
+        for box in portable_boxes:
+            items = [
+                tag
+                for tag in _iter_tags(box, _PORTABLE_ITEM_TAGS)
+                if tag.get("data-source") or any("pi-item" in c for c in tag.get("class") or ())
+            ]
             for item in items[:80]:
-                label_node = item.find(class_=re.compile(r"(pi-data-label|label|name)", re.IGNORECASE))
-                value_node = item.find(class_=re.compile(r"(pi-data-value|value)", re.IGNORECASE))
+                label_node = item.find(class_=_PI_LABEL_RE)
+                value_node = item.find(class_=_PI_VALUE_RE)
                 key_text = ""
                 val_text = ""
                 if label_node:
@@ -223,17 +269,23 @@ class WikiStructuredParser:
         tables: List[List[str]] = []
         content = soup.find("div", class_="mw-parser-output") or soup.find("body") or soup
 
-        identity_keys = ["姓名", "本名", "别名", "身份", "职业", "性别", "生日", "身高", "体重", "所属", "阵营", "配音", "种族"]
-        skill_noise = ["攻击", "伤害", "技能", "冷却", "等级", "效果", "倍率", "命中", "普攻", "重击"]
-
         for table in content.find_all("table")[:3]:
             rows: List[str] = []
-            raw_text = table.get_text(" ", strip=True)
-            if not raw_text:
+            # Classify from the table's strings as they are walked instead of joining the
+            # whole table with get_text(): keywords never contain the " " separator, so a
+            # per-string test finds the same matches, and an identity hit ends the walk.
+            has_text = False
+            has_identity = False
+            has_skill_noise = False
+            for text in table.stripped_strings:
+                has_text = True
+                if _TABLE_IDENTITY_RE.search(text):
+                    has_identity = True
+                    break
+                if not has_skill_noise and _TABLE_SKILL_NOISE_RE.search(text):
+                    has_skill_noise = True
+            if not has_text:
                 continue
-
-            has_identity = any(key in raw_text for key in identity_keys)
-            has_skill_noise = any(key in raw_text for key in skill_noise)
             if has_skill_noise and not has_identity:
                 continue
 
@@ -249,8 +301,8 @@ class WikiStructuredParser:
                     rows.append(f"{texts[0]}: {texts[1]}")
                 else:
                     rows.append(" | ".join(texts))
-        if rows:
-            tables.append(rows)
+            if rows:
+                tables.append(rows)
 
         return tables
 
@@ -266,8 +318,7 @@ class WikiStructuredParser:
             header_lower = str(header_text or "").strip().lower()
 
             section_type = None
-            for s_type, keywords in self.SECTION_KEYWORDS.items():
-                keyword_lowers = [str(kw or "").strip().lower() for kw in (keywords or []) if str(kw or "").strip()]
+            for s_type, keyword_lowers in self._SECTION_KEYWORDS_LOWER:
                 if any(kw in header_lower for kw in keyword_lowers):
                     section_type = s_type
                     break
@@ -297,13 +348,18 @@ class WikiStructuredParser:
 
     def extract_summary(self, soup: BeautifulSoup) -> str:
         """Extract the first meaningful paragraph as summary"""
-        for p in soup.find_all("p"):
+        # Walk descendants lazily instead of find_all("p"): the summary is normally one of
+        # the first paragraphs, so the rest of the tree is never visited.
+        for p in soup.descendants:
+            if p.name != "p":
+                continue
             is_clean = True
             for parent in p.parents:
-                if parent.name in ["table", "li", "ul", "footer"]:
+                if parent.name in _SUMMARY_EXCLUDED_PARENTS:
                     is_clean = False
                     break
-                if parent.get("class") and any("navbox" in c for c in parent.get("class")):
+                classes = parent.get("class")
+                if classes and any("navbox" in c for c in classes):
                     is_clean = False
                     break
 
@@ -372,5 +428,25 @@ class WikiStructuredParser:
         return text
 
 
+@lru_cache(maxsize=1024)
+def _standard_field_key(key_text: str) -> str:
+    """
+    信息框字段名归一（按原文缓存）/ Standard infobox field key for a label, memoized.
+
+    Infobox labels come from a small vocabulary that repeats across rows and pages.
+    Values are not cached: they are mostly unique and can be long.
+    """
+    key = _clean_text(key_text)
+    if not key:
+        return ""
+    key_lower = key.lower()
+    for keyword, std_key in WikiStructuredParser._FIELD_KEYWORDS:
+        if keyword in key_lower:
+            return std_key
+    if 1 < len(key) < 30:
+        return key
+    return ""
+
+
 wiki_parser = WikiStructuredParser()
 
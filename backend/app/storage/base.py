@@ -33,7 +33,12 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-class _SafeCompatLoader(yaml.SafeLoader):
+# libyaml 加速的 Loader（未编译 libyaml 时回退到纯 Python 实现）
+# C-accelerated loader when PyYAML was built with libyaml; same safe semantics otherwise.
+_BaseSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class _SafeCompatLoader(_BaseSafeLoader):
     """
     安全 YAML Loader（带兼容层）。
 
@@ -50,7 +55,7 @@ _PY_APPLY_TAG_PREFIX = "tag:yaml.org,2002:python/object/apply:"
 _ALLOWED_PY_APPLY_SUFFIX_PREFIXES = ("app.schemas.enums.",)
 
 
-def _construct_python_apply(loader: yaml.SafeLoader, suffix: str, node: yaml.Node) -> Any:
+def _construct_python_apply(loader: _BaseSafeLoader, suffix: str, node: yaml.Node) -> Any:
     if not suffix.startswith(_ALLOWED_PY_APPLY_SUFFIX_PREFIXES):
         raise yaml.constructor.ConstructorError(
             None,
@@ -259,6 +264,25 @@ class BaseStorage:
             content = await f.read()
             return yaml.load(content, Loader=_SafeCompatLoader)
 
+    def read_yaml_sync(self, file_path: Path) -> Dict[str, Any]:
+        """
+        同步读取YAML文件（适用于小型元数据文件）
+
+        Read YAML file synchronously. Intended for tiny metadata files on hot
+        request paths, where aiofiles' thread hand-off costs more than the read.
+
+        Args:
+            file_path: YAML文件路径 / Path to YAML file
+
+        Returns:
+            解析后的内容（字典） / Parsed YAML content
+
+        Raises:
+            FileNotFoundError: 如果文件不存在 / If file not found
+        """
+        with open(file_path, 'rb') as f:
+            return yaml.load(f, Loader=_SafeCompatLoader)
+
     async def write_yaml(self, file_path: Path, data: Dict[str, Any]) -> None:
         """
         异步写入YAML文件
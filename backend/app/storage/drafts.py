@@ -29,6 +29,8 @@ class DraftStorage(BaseStorage):
         super().__init__(data_dir)
         self.context_retriever = DynamicContextRetriever(self)
         self.volume_storage = VolumeStorage(data_dir)
+        # final.md path -> (st_mtime_ns, st_size, character count)
+        self._final_length_cache: Dict[str, Tuple[int, int, int]] = {}
 
     def _canonicalize_chapter_id(self, chapter_id: str) -> str:
         normalized = normalize_chapter_id(chapter_id)
@@ -431,6 +433,28 @@ class DraftStorage(BaseStorage):
             pass
         return text
 
+    async def get_final_draft_length(self, project_id: str, chapter: str) -> int:
+        """Get the character count of a final draft (0 if missing).
+
+        The count is cached per file and reused while its mtime and size are unchanged,
+        so repeated stats requests only stat the file.
+        """
+        resolved = self._resolve_chapter_dir_name(project_id, chapter)
+        file_path = self.get_project_path(project_id) / "drafts" / resolved / "final.md"
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            text = await self.get_final_draft(project_id, resolved)
+            return len(text) if text else 0
+
+        key = str(file_path)
+        cached = self._final_length_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        length = len(await self.read_text(file_path))
+        self._final_length_cache[key] = (st.st_mtime_ns, st.st_size, length)
+        return length
+
     async def save_chapter_summary(self, project_id: str, summary: ChapterSummary) -> None:
         """Save a chapter summary."""
         raw_chapter = summary.chapter
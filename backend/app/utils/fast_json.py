@@ -0,0 +1,29 @@
+"""
+Fast JSON helpers.
+快速 JSON 工具（orjson 可用时启用 C 加速）。
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+# orjson 为可选依赖 / orjson is optional; fall back to the stdlib encoder
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed.
+
+    Intended for endpoints returning large plain dict/list payloads (listings, stats,
+    batch analysis); output is equivalent to the default compact, non-ASCII-escaped JSON.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if _orjson_available:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
@@ -33,7 +33,12 @@ def normalize_newlines(text: str | None) -> str:
         >>> normalize_newlines(None)
         ""
     """
-    return (text or "").replace("\r\n", "\n").replace("\r", "\n")
+    if not text:
+        return ""
+    # 绝大多数文本不含 \r：一次 C 级扫描即可返回 / Common case: a single scan, no copies
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
 def normalize_for_compare(text: str | None) -> str:
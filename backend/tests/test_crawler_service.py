@@ -0,0 +1,84 @@
+"""Test app.services.crawler_service"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.crawler_service import CrawlerService
+
+GBK_PAGE = (
+    "<html><head><meta charset=\"gbk\"><title>中文 page</title></head>"
+    "<body><p>这是一个用于测试字符集识别的中文页面，正文需要足够长。</p></body></html>"
+).encode("gbk")
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    # Paths answered with 503 once before the page is served.
+    flaky = set()
+
+    def do_GET(self):
+        if self.path in self.flaky:
+            self.flaky.discard(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        # Bare text/html: the charset is only declared in the page's <meta>.
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(GBK_PAGE)))
+        self.end_headers()
+        self.wfile.write(GBK_PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def page_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/page"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# --- charset handling ---
+
+class TestMetaCharset:
+    def test_sync_scrape(self, page_url):
+        result = CrawlerService().scrape_page(page_url)
+        assert result["success"]
+        assert result["title"] == "中文 page"
+        assert "中文页面" in result["llm_content"]
+
+    async def test_batch_scrape_matches_sync(self, page_url):
+        crawler = CrawlerService()
+        try:
+            [batch] = await crawler.scrape_pages_concurrent([page_url])
+        finally:
+            await crawler.aclose()
+        assert batch["success"]
+        assert batch["title"] == "中文 page"
+        assert "中文页面" in batch["llm_content"]
+        # The batch result is cached; scrape_page must serve the same text from it.
+        assert crawler.scrape_page(page_url)["llm_content"] == batch["llm_content"]
+
+
+# --- transient failures ---
+
+class TestTransientStatus:
+    async def test_batch_retries_through_scrape_page(self, page_url):
+        flaky_url = page_url + "?flaky"
+        _PageHandler.flaky.add("/page?flaky")
+        crawler = CrawlerService()
+        try:
+            [batch] = await crawler.scrape_pages_concurrent([flaky_url])
+        finally:
+            await crawler.aclose()
+            _PageHandler.flaky.clear()
+        assert batch["success"]
+        assert batch["title"] == "中文 page"
@@ -0,0 +1,40 @@
+"""Test app.routers.projects"""
+import os
+
+import pytest
+
+from app.routers.projects import _fast_rmtree
+
+
+# --- _fast_rmtree ---
+
+class TestFastRmtree:
+    def test_removes_nested_tree(self, tmp_path):
+        root = tmp_path / "project"
+        (root / "drafts" / "ch1").mkdir(parents=True)
+        (root / "drafts" / "ch1" / "v1.md").write_text("x", encoding="utf-8")
+        (root / "project.yaml").write_text("name: p", encoding="utf-8")
+        _fast_rmtree(str(root))
+        assert not root.exists()
+
+    def test_does_not_follow_directory_links(self, tmp_path):
+        target = tmp_path / "outside"
+        target.mkdir()
+        (target / "keep.txt").write_text("keep", encoding="utf-8")
+        root = tmp_path / "project"
+        (root / "cards").mkdir(parents=True)
+        os.symlink(target, root / "cards" / "linked", target_is_directory=True)
+        _fast_rmtree(str(root))
+        assert not root.exists()
+        assert (target / "keep.txt").read_text(encoding="utf-8") == "keep"
+
+    def test_refuses_linked_root(self, tmp_path):
+        target = tmp_path / "real"
+        (target / "drafts").mkdir(parents=True)
+        (target / "drafts" / "ch1.md").write_text("keep", encoding="utf-8")
+        alias = tmp_path / "alias"
+        os.symlink(target, alias, target_is_directory=True)
+        with pytest.raises(OSError):
+            _fast_rmtree(str(alias))
+        assert alias.is_symlink()
+        assert (target / "drafts" / "ch1.md").read_text(encoding="utf-8") == "keep"
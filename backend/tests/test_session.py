@@ -0,0 +1,36 @@
+"""Test app.routers.session orchestrator pool"""
+import pytest
+
+from app.orchestrator import SessionStatus
+from app.routers import session
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(session, "_MAX_POOL_SIZE", 3)
+    monkeypatch.setattr(session, "_orchestrators", {})
+    monkeypatch.setattr(session, "_hits", {})
+    monkeypatch.setattr(session, "_swept_hits", {})
+    monkeypatch.setattr(session, "_last_access", {})
+    return session._orchestrators
+
+
+# --- _evict_least_used ---
+
+class TestPoolEviction:
+    def test_busy_newcomer_survives_next_newcomer(self, pool):
+        for project_id in ("a", "b"):
+            for _ in range(5):
+                session.get_orchestrator(project_id, "zh")
+        first = session.get_orchestrator("new1", "zh")
+        first.current_status = SessionStatus.WRITING_DRAFT
+        session.get_orchestrator("new2", "zh")
+        assert session.get_orchestrator("new1", "zh") is first
+        assert "new2" in pool
+        assert len(pool) == 3
+
+    def test_equal_hits_evict_oldest_access(self, pool):
+        for project_id in ("a", "b", "c"):
+            session.get_orchestrator(project_id, "zh")
+        session.get_orchestrator("d", "zh")
+        assert list(pool) == ["b", "c", "d"]
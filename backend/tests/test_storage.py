@@ -2,6 +2,7 @@
 import pytest
 from pathlib import Path
 from app.storage.base import BaseStorage
+from app.storage.drafts import DraftStorage
 
 
 @pytest.fixture
@@ -29,6 +30,19 @@ async def test_read_yaml_missing_raises(storage, tmp_path):
         await storage.read_yaml(filepath)
 
 
+@pytest.mark.asyncio
+async def test_read_yaml_sync_matches_async(storage, tmp_path):
+    filepath = tmp_path / "project.yaml"
+    data = {"name": "测试项目", "language": "zh"}
+    await storage.write_yaml(filepath, data)
+    assert storage.read_yaml_sync(filepath) == await storage.read_yaml(filepath)
+
+
+def test_read_yaml_sync_missing_raises(storage, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        storage.read_yaml_sync(tmp_path / "nonexistent.yaml")
+
+
 @pytest.mark.asyncio
 async def test_write_and_read_text(storage, tmp_path):
     project_dir = tmp_path / "test_proj"
@@ -39,3 +53,13 @@ async def test_write_and_read_text(storage, tmp_path):
     assert filepath.exists()
     result = await storage.read_text(filepath)
     assert "Hello world" in result
+
+
+@pytest.mark.asyncio
+async def test_final_draft_length_tracks_content(tmp_path):
+    drafts = DraftStorage(data_dir=str(tmp_path))
+    assert await drafts.get_final_draft_length("proj", "C1") == 0
+    await drafts.save_final_draft("proj", "C1", "你好，世界")
+    assert await drafts.get_final_draft_length("proj", "C1") == len("你好，世界")
+    await drafts.save_final_draft("proj", "C1", "第二版正文内容")
+    assert await drafts.get_final_draft_length("proj", "C1") == len("第二版正文内容")
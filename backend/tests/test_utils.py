@@ -23,6 +23,10 @@ class TestNormalizeNewlines:
     def test_mixed(self):
         assert normalize_newlines("a\r\nb\rc\nd") == "a\nb\nc\nd"
 
+    def test_lf_only_unchanged(self):
+        text = "第一段\n\n第二段"
+        assert normalize_newlines(text) is text
+
 
 # --- normalize_for_compare ---
 
@@ -0,0 +1,24 @@
+"""Test app.services.wiki_parser"""
+from app.services.wiki_parser import wiki_parser
+
+
+# --- extract_tables ---
+
+class TestExtractTables:
+    def test_page_without_tables(self):
+        parsed = wiki_parser.parse_page("<p>只有正文，没有表格的页面。</p>", title="T")
+        assert parsed["tables"] == []
+
+    def test_keeps_every_table(self):
+        html = (
+            "<table><tr><th>姓名</th><td>甲</td></tr></table>"
+            "<table><tr><th>身份</th><td>学生</td></tr></table>"
+        )
+        assert wiki_parser.parse_page(html)["tables"] == [["姓名: 甲"], ["身份: 学生"]]
+
+    def test_skips_skill_tables_without_identity(self):
+        html = (
+            "<table><tr><th>技能</th><td>冷却 3 秒</td></tr></table>"
+            "<table><tr><th>技能</th><td>攻击</td></tr><tr><th>姓名</th><td>乙</td></tr></table>"
+        )
+        assert wiki_parser.parse_page(html)["tables"] == [["技能: 攻击", "姓名: 乙"]]